@@ -0,0 +1,79 @@
+# 📁 app/benchmarks/bench_clean.py
+# Summary cleaning and feed parsing cost: BeautifulSoup for every entry vs. the
+# tiered clean_summary, and inline vs. process-pool parsing of large feeds.
+# Usage: python -m benchmarks.bench_clean [--entries 2000] [--feeds 8] [--feed-entries 3000]
+
+import argparse, random, time, timeit
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+from bs4 import BeautifulSoup
+
+from scraping import fetcher
+
+# Summary shapes seen across the configured feeds: many empty or plain, most
+# markup a few inline tags, occasionally embedded scripts / comments
+SUMMARY_SHAPES = [
+    (30, lambda i: ""),
+    (30, lambda i: f"Government announces new policy on item {i} after cabinet meeting in New Delhi."),
+    (5, lambda i: f"Markets rally &amp; rupee gains as Sensex adds {i} points &ndash; analysts cautious."),
+    (25, lambda i: f'<p><img src="https://example.com/{i}.jpg" alt="photo" /></p><p>Officials said the <b>report {i}</b> would be tabled on Monday. <a href="https://example.com/{i}?a=1&amp;b=2">Read more</a></p>'),
+    (10, lambda i: f'<div class="story"><!-- ad slot --><script>var slot = {i};</script><p>Opposition leaders &amp; allies met on day {i}.</p></div>'),
+]
+
+def make_summaries(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    weights = [w for w, _ in SUMMARY_SHAPES]
+    shapes = rng.choices([shape for _, shape in SUMMARY_SHAPES], weights=weights, k=count)
+    return [shape(i) for i, shape in enumerate(shapes)]
+
+def make_feed(entries: int, seed: int = 0) -> bytes:
+    summaries = make_summaries(entries, seed)
+    items = "".join(
+        f"<item><title>Story {seed}-{i}</title><link>https://example.com/{seed}/{i}</link>"
+        f"<description>{escape(summary)}</description><pubDate>Mon, 06 Oct 2025 10:{i % 60:02d}:00 +0530</pubDate></item>"
+        for i, summary in enumerate(summaries)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>Fixture {seed}</title>{items}</channel></rss>'.encode()
+
+def legacy_clean_summary(summary_html):
+    soup = BeautifulSoup(summary_html, "html.parser")
+    return soup.get_text()
+
+def bench_clean(entries: int):
+    summaries = make_summaries(entries)
+    mismatches = sum(fetcher.clean_summary(s) != legacy_clean_summary(s) for s in summaries)
+    legacy = min(timeit.repeat(lambda: [legacy_clean_summary(s) for s in summaries], number=1, repeat=3))
+    tiered = min(timeit.repeat(lambda: [fetcher.clean_summary(s) for s in summaries], number=1, repeat=3))
+    print(f"clean_summary over {entries} summaries ({mismatches} output mismatches)")
+    print(f"  BeautifulSoup {legacy * 1000:8.1f} ms   tiered {tiered * 1000:8.1f} ms   speedup {legacy / tiered:5.1f}x")
+
+def bench_parse(feeds: int, feed_entries: int):
+    documents = [make_feed(feed_entries, seed) for seed in range(feeds)]
+    size_kb = sum(len(d) for d in documents) / feeds / 1024
+    print(f"parsing {feeds} feeds of {feed_entries} entries (~{size_kb:.0f} KB each) on {fetcher.FETCH_WORKERS} fetch threads")
+
+    def run(parse):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=fetcher.FETCH_WORKERS) as pool:
+            results = list(pool.map(parse, documents))
+        return time.perf_counter() - start, results
+
+    inline_s, inline_results = run(fetcher.parse_feed_entries)
+    fetcher.parse_feed(documents[0])  # Start the worker processes outside the timing
+    pooled_s, pooled_results = run(fetcher.parse_feed)
+    fetcher.shutdown_parse_pool()
+    assert inline_results == pooled_results
+    print(f"  inline {inline_s * 1000:8.1f} ms   process pool ({fetcher.FEED_PARSE_PROCESSES} workers) {pooled_s * 1000:8.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--feeds", type=int, default=8)
+    parser.add_argument("--feed-entries", type=int, default=3000)
+    args = parser.parse_args()
+    bench_clean(args.entries)
+    bench_parse(args.feeds, args.feed_entries)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# 📁 app/benchmarks/bench_digest.py
+# Render cost of 50-article digests: the original += concatenation vs. the
+# template renderer in services/digest.py.
+# Usage: python -m benchmarks.bench_digest [--articles 50] [--repeat 200]
+
+import argparse, json, os, timeit
+
+from services import digest
+
+ARTICLE_FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "article.json")
+
+# The original implementations, kept verbatim as the baseline
+def legacy_format_articles_for_email(articles):
+    """Format articles for email content"""
+    email_content = """
+    <html>
+    <head>
+        <style>
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .header { background: #667eea; color: white; padding: 20px; text-align: center; }
+            .article { border: 1px solid #ddd; margin: 20px 0; padding: 15px; border-radius: 8px; }
+            .source { background: #667eea; color: white; padding: 5px 10px; border-radius: 15px; font-size: 12px; }
+            .title { color: #1e293b; font-size: 18px; font-weight: bold; margin: 10px 0; }
+            .summary { color: #64748b; margin: 10px 0; }
+            .link { color: #667eea; text-decoration: none; }
+            .footer { text-align: center; color: #64748b; margin-top: 30px; }
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>📰 Your News Update from Taaza Khabar</h1>
+            <p>Here are your selected news articles</p>
+        </div>
+    """
+    
+    for article in articles:
+        email_content += f"""
+        <div class="article">
+            <span class="source">{article.get('source', 'Unknown')}</span>
+            <h2 class="title">{article.get('title', 'No Title')}</h2>
+            <p class="summary">{article.get('summary', 'No summary available')}</p>
+            <p><strong>Published:</strong> {article.get('published', 'Unknown date')}</p>
+            <p><a href="{article.get('link', '#')}" class="link" target="_blank">Read Full Article →</a></p>
+        </div>
+        """
+    
+    email_content += """
+        <div class="footer">
+            <p>Powered by Taaza Khabar - Intelligent News Without Overload</p>
+            <p>This email was sent because you requested news updates through our platform.</p>
+        </div>
+    </body>
+    </html>
+    """
+    
+    return email_content
+
+def legacy_format_articles_for_whatsapp(articles):
+    """Format articles for WhatsApp message"""
+    message = "📰 *Your News Update from Taaza Khabar*\n\n"
+    
+    for i, article in enumerate(articles, 1):
+        message += f"*{i}. {article.get('title', 'No Title')}*\n"
+        message += f"📍 Source: {article.get('source', 'Unknown')}\n"
+        message += f"📅 {article.get('published', 'Unknown date')}\n\n"
+        message += f"{article.get('summary', 'No summary available')}\n\n"
+        if article.get('link'):
+            message += f"🔗 Read more: {article.get('link')}\n\n"
+        message += "─────────────────\n\n"
+    
+    message += "Powered by Taaza Khabar 🤖\n"
+    message += "Intelligent News Without Overload"
+    
+    return message
+
+def load_articles(count: int):
+    with open(ARTICLE_FIXTURE, encoding="utf-8") as f:
+        articles = json.load(f)
+    # Repeat the fixture if it has fewer articles than requested
+    return [dict(articles[i % len(articles)], title=f"{articles[i % len(articles)]['title']} #{i}") for i in range(count)]
+
+def per_call_ms(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=repeat, repeat=5)) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    articles = load_articles(args.articles)
+
+    print(f"{args.articles}-article digest, ms per render (best of 5 x {args.repeat})")
+    for channel, legacy, current in (
+        ("email", legacy_format_articles_for_email, digest.format_articles_for_email),
+        ("whatsapp", legacy_format_articles_for_whatsapp, digest.format_articles_for_whatsapp),
+    ):
+        legacy_ms = per_call_ms(lambda: legacy(articles), args.repeat)
+        current_ms = per_call_ms(lambda: current(articles), args.repeat)
+        print(f"  {channel:9s} legacy {legacy_ms:7.3f}   templates {current_ms:7.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# 📁 app/benchmarks/bench_mailer.py
+# Throughput of the pooled mail queue vs. a fresh SMTP connection per message.
+# Usage: python -m benchmarks.bench_mailer [--messages 1000] [--latency 0.002]
+
+import argparse, smtplib, time
+
+from benchmarks.smtp_stub import SMTPStub
+from services.mailer import MailQueue, build_message
+
+HTML = "<html><body><h1>News</h1><p>Benchmark digest</p></body></html>"
+
+def connection_per_message(port: int, count: int) -> float:
+    """The old /send-email behaviour: connect, send, quit for every message"""
+    start = time.perf_counter()
+    for i in range(count):
+        msg = build_message("bench@localhost", f"user{i}@localhost", "Benchmark", HTML)
+        with smtplib.SMTP("127.0.0.1", port) as server:
+            server.send_message(msg)
+    return time.perf_counter() - start
+
+def pooled_queue(port: int, count: int, pool_size: int) -> float:
+    queue = MailQueue({
+        "server": "127.0.0.1", "port": port, "sender": "bench@localhost", "password": None,
+        "starttls": False, "pool_size": pool_size, "max_retries": 3, "retry_backoff": 0.05,
+        "idle_timeout": 60, "timeout": 10
+    })
+    queue.start()
+    start = time.perf_counter()
+    for i in range(count):
+        queue.enqueue(f"user{i}@localhost", "Benchmark", HTML)
+    queue.join()
+    elapsed = time.perf_counter() - start
+    queue.stop()
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--pool-size", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.002,
+                        help="seconds added before each server reply to mimic network round-trips")
+    args = parser.parse_args()
+
+    stub = SMTPStub(latency=args.latency).start()
+    try:
+        for name, run in (
+            ("connection per message", lambda: connection_per_message(stub.port, args.messages)),
+            (f"pooled queue ({args.pool_size} connections)", lambda: pooled_queue(stub.port, args.messages, args.pool_size)),
+        ):
+            stub.messages = stub.connections = 0
+            elapsed = run()
+            print(f"{name:32s} {args.messages} msgs in {elapsed:6.2f}s  "
+                  f"{args.messages / elapsed:8.1f} msg/s  ({stub.connections} connections)")
+    finally:
+        stub.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# 📁 app/benchmarks/bench_summarize.py
+# Ingestion-time summarization against the stub model: Gemini requests and
+# tokens for one ingestion run, then the same run again served from the
+# content-hash cache, vs. one chat round-trip per article.
+# Usage: python -m benchmarks.bench_summarize [--articles 100] [--latency 0.5]
+
+import argparse, time
+
+from benchmarks.offline import OfflineEnvironment
+from scraping import fetcher
+from scraping.dedup import recent_keys
+from scraping.health import source_health
+from services import summarizer
+from services.metrics import LLM_TOKENS
+
+def tokens() -> float:
+    return LLM_TOKENS._values.get(("prompt",), 0) + LLM_TOKENS._values.get(("completion",), 0)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.5, help="stub model seconds per request")
+    args = parser.parse_args()
+
+    summarizer.SUMMARIZE_AT_INGEST = True
+    with OfflineEnvironment(llm_latency=args.latency) as env:
+        for run in ("first run", "re-ingest"):
+            source_health.reset()
+            # As after a restart: the second run's summaries must come from the article store
+            recent_keys.clear()
+            summarizer.summary_cache.clear()
+            calls, spent, start = env.model.calls, tokens(), time.perf_counter()
+            articles = fetcher.get_news(args.articles)["articles"]
+            elapsed = time.perf_counter() - start
+            generated = sum(1 for a in articles if a.get("summary_generated"))
+            print(f"{run:10s} {len(articles)} articles, {generated} with generated summaries: "
+                  f"{env.model.calls - calls} Gemini requests, ~{tokens() - spent:.0f} tokens, {elapsed:.2f}s")
+        print(f"per-reader /chat instead: one request per article asked about (~{args.latency:.1f}s each)")
+
+if __name__ == "__main__":
+    main()
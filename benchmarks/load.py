@@ -0,0 +1,109 @@
+# 📁 app/benchmarks/load.py
+# HTTP load scenarios against the full app served by uvicorn on localhost,
+# with every external dependency replaced by the offline stand-ins.
+# Usage: python -m benchmarks.load [--requests 500] [--concurrency 20]
+
+import argparse, asyncio, contextlib, os, socket, statistics, threading, time
+from typing import Any, Callable, Dict, List
+
+import httpx
+import uvicorn
+
+from benchmarks.offline import OfflineEnvironment
+
+CHAT_QUERIES = [f"What is the latest on story {i}?" for i in range(50)]
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+@contextlib.contextmanager
+def serve(app):
+    """Run the app (lifespan included) on a background uvicorn server"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=_free_port(), log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{server.config.port}"
+    finally:
+        server.should_exit = True
+        thread.join(10)
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+async def run_scenario(base_url: str, make_request: Callable[[httpx.AsyncClient, int], Any],
+                       total: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker(client: httpx.AsyncClient):
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                response = await make_request(client, i)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {
+        "requests": total,
+        "errors": errors,
+        "p50_ms": percentile(latencies, 0.50),
+        "p99_ms": percentile(latencies, 0.99),
+        "mean_ms": statistics.fmean(latencies),
+        "throughput_rps": total / elapsed
+    }
+
+SCENARIOS = {
+    "GET /articles": lambda client, i: client.get("/articles", params={"limit": 50}),
+    # A polling client revalidating the page it already has
+    "GET /articles 304": lambda client, i: client.get("/articles", params={"limit": 50}, headers={"If-None-Match": ETAGS["articles"]}),
+    "GET /news/{n}": lambda client, i: client.get("/news/20"),
+    "POST /chat": lambda client, i: client.post("/chat", json={"query": CHAT_QUERIES[i % len(CHAT_QUERIES)]}),
+    "POST /send-email": lambda client, i: client.post("/send-email", json={"email": f"user{i}@localhost", "articles": ARTICLES}),
+}
+
+ARTICLES: List[Dict[str, Any]] = []
+ETAGS: Dict[str, str] = {}
+
+def run(total: int = 500, concurrency: int = 20) -> Dict[str, Dict[str, float]]:
+    results = {}
+    # Keep per-scrape log lines out of the report
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    with OfflineEnvironment():
+        import main
+
+        with serve(main.app) as base_url:
+            # Populate the buffer and store once before measuring the read paths
+            ARTICLES[:] = httpx.post(f"{base_url}/scrape", params={"n": 50}, timeout=60).json()["articles"][:10]
+            ETAGS["articles"] = httpx.get(f"{base_url}/articles", params={"limit": 50}).headers["etag"]
+            for name, make_request in SCENARIOS.items():
+                results[name] = asyncio.run(run_scenario(base_url, make_request, total, concurrency))
+            main.mail_queue.join()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    for name, r in run(args.requests, args.concurrency).items():
+        print(f"  {name:18s} p50 {r['p50_ms']:8.2f} ms   p99 {r['p99_ms']:8.2f} ms   "
+              f"{r['throughput_rps']:8.1f} req/s   errors {r['errors']}")
+
+if __name__ == "__main__":
+    main()
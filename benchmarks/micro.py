@@ -0,0 +1,66 @@
+# 📁 app/benchmarks/micro.py
+# Micro-benchmarks of the ingestion and rendering hot paths against the
+# offline fixtures. Each result is the best-of-5 mean time per call in ms.
+# Usage: python -m benchmarks.micro [--repeat 20]
+
+import argparse, timeit
+from typing import Dict
+
+from benchmarks.offline import CANNED_ANSWER, OfflineEnvironment
+from scraping import fetcher
+from scraping.dedup import recent_keys
+from scraping.health import source_health
+from services import digest
+from services.chat_format import clean_markdown, parse_response_sections
+from storage.articles import MemoryArticleRepository, set_repository
+
+def per_call_ms(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=repeat, repeat=5)) / repeat * 1000
+
+def run(repeat: int = 20) -> Dict[str, float]:
+    results = {}
+    with OfflineEnvironment() as env:
+        def get_news_cold():
+            # Every feed due and nothing stored yet, so each call parses and inserts every entry
+            source_health.reset()
+            recent_keys.clear()
+            set_repository(MemoryArticleRepository())
+            return fetcher.get_news(50)
+
+        def get_news():
+            # Every feed due, but the entries are already stored and skipped before parsing
+            source_health.reset()
+            return fetcher.get_news(50)
+
+        articles = get_news_cold()["articles"]
+        results["get_news_50_cold"] = per_call_ms(get_news_cold, max(1, repeat // 10))
+        results["get_news_50"] = per_call_ms(get_news, max(1, repeat // 10))
+        # Steady state: feeds polled within their publish interval come from the feed cache
+        fetcher.get_news(50)
+        results["get_news_50_not_due"] = per_call_ms(lambda: fetcher.get_news(50), repeat)
+
+        summaries = [
+            entry["summary"]
+            for source in fetcher.RSS_FEEDS.values()
+            for entry in fetcher.parse_feed_entries(env.feeds.get(source).content)
+        ]
+        results[f"clean_summary_x{len(summaries)}"] = per_call_ms(
+            lambda: [fetcher.clean_summary(s) for s in summaries], repeat
+        )
+
+        answer = clean_markdown(CANNED_ANSWER * 4)
+        results["parse_response_sections"] = per_call_ms(lambda: parse_response_sections(answer), repeat * 50)
+
+        for name, render in (("email", digest.format_articles_for_email), ("whatsapp", digest.format_articles_for_whatsapp)):
+            results[f"format_{name}"] = per_call_ms(lambda: render(articles), repeat * 10)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    for name, ms in run(args.repeat).items():
+        print(f"  {name:28s} {ms:9.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# 📁 app/benchmarks/offline.py
+# Offline stand-ins for everything the service talks to: recorded feeds
+# instead of the publishers, the in-memory article store instead of Atlas,
+# and stub Gemini / SMTP / WhatsApp backends with configurable latency.
+
+import asyncio, json, os, re, shutil, tempfile, time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+
+from benchmarks.record_feeds import fixture_path
+from benchmarks.smtp_stub import SMTPStub
+from scraping import fetcher
+from scraping.dedup import recent_keys
+from services import llm, summarizer, whatsapp
+from storage.articles import MemoryArticleRepository, set_repository
+
+CANNED_ANSWER = """## Summary
+
+The **cabinet** approved the new policy on Monday after a long debate.
+
+- Markets reacted positively, with the Sensex up 1.2%
+- Opposition parties asked for a *detailed* review
+- Officials expect the rules to take effect next month
+
+Further details are expected after the review committee reports back.
+"""
+
+_PUB_DATE = re.compile(rb"<pubDate>([^<]+)</pubDate>")
+
+def rebase_pub_dates(documents: Dict[str, bytes], newest: datetime) -> Dict[str, bytes]:
+    """Shift every <pubDate> by the same amount so the newest entry is published at `newest`.
+
+    The recorded dates are fixed, so the fixtures would otherwise age out of
+    the hot window and be archived instead of stored.
+    """
+    dates = [parsedate_to_datetime(m.group(1).decode()) for doc in documents.values() for m in _PUB_DATE.finditer(doc)]
+    if not dates:
+        return documents
+    offset = newest - max(dates)
+
+    def shift(match):
+        published = parsedate_to_datetime(match.group(1).decode()) + offset
+        return b"<pubDate>" + format_datetime(published).encode() + b"</pubDate>"
+    return {url: _PUB_DATE.sub(shift, doc) for url, doc in documents.items()}
+
+class FixtureResponse:
+    """The parts of requests.Response that fetch_feed uses"""
+
+    def __init__(self, content: bytes, status_code: int = 200):
+        self.content = content
+        self.status_code = status_code
+        self.headers: Dict[str, str] = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+class FixtureFeeds:
+    """Serves the recorded feed files in place of requests.get, with optional network latency"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self._documents = {}
+        for source, url in fetcher.RSS_FEEDS.items():
+            with open(fixture_path(source), "rb") as f:
+                self._documents[url] = f.read()
+        # Whole minutes, so entry times look like the recorded ones
+        self._documents = rebase_pub_dates(self._documents, datetime.now(timezone.utc).replace(second=0, microsecond=0))
+
+    def get(self, url: str, timeout: Optional[float] = None, headers: Optional[Dict[str, str]] = None):
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        content = self._documents.get(url)
+        if content is None:
+            return FixtureResponse(b"", 404)
+        return FixtureResponse(content)
+
+class _Usage:
+    def __init__(self, prompt: str, text: str):
+        # Roughly four characters per token, like the summarizer's estimate
+        self.prompt_token_count = len(prompt) // 4
+        self.candidates_token_count = len(text) // 4
+
+class _StubResponse:
+    def __init__(self, text: str, prompt: str = ""):
+        self.text = text
+        self.usage_metadata = _Usage(prompt, text)
+
+class StubModel:
+    """Answers chat prompts with CANNED_ANSWER after `latency` seconds (streamed line by line)
+    and summarization batches with one JSON summary per article"""
+
+    def __init__(self, latency: float = 0.05, answer: str = CANNED_ANSWER):
+        self.latency = latency
+        self.answer = answer
+        self.calls = 0
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        self.calls += 1
+        if prompt.startswith(summarizer.PROMPT_HEADER):
+            time.sleep(self.latency)
+            return _StubResponse(self._summaries(prompt), prompt)
+        if not stream:
+            time.sleep(self.latency)
+            return _StubResponse(self.answer, prompt)
+        return self._stream()
+
+    @staticmethod
+    def _summaries(prompt: str) -> str:
+        items = [json.loads(line) for line in prompt[len(summarizer.PROMPT_HEADER):].splitlines() if line.strip()]
+        return "```json\n" + json.dumps([
+            {"id": item["id"], "summary": f"{item['source']} reports: {item['title']}."} for item in items
+        ]) + "\n```"
+
+    def _stream(self):
+        lines = self.answer.splitlines(keepends=True)
+        for line in lines:
+            time.sleep(self.latency / len(lines))
+            yield _StubResponse(line)
+
+class StubWhatsAppTransport:
+    """Accepts every message after `latency` seconds per chunk"""
+
+    name = "stub"
+    simulation = False
+
+    def __init__(self, latency: float = 0.02):
+        self.latency = latency
+        self.sent = 0
+
+    async def send(self, to: str, messages: List[str]) -> Dict[str, Any]:
+        for _ in messages:
+            await asyncio.sleep(self.latency)
+        self.sent += 1
+        return {"messages": len(messages)}
+
+    async def close(self):
+        pass
+
+class OfflineEnvironment:
+    """Installs every stand-in; use as a context manager around a benchmark run"""
+
+    def __init__(self, feed_latency: float = 0.0, llm_latency: float = 0.05,
+                 smtp_latency: float = 0.002, whatsapp_latency: float = 0.02):
+        self.feeds = FixtureFeeds(feed_latency)
+        self.model = StubModel(llm_latency)
+        self.transport = StubWhatsAppTransport(whatsapp_latency)
+        self.smtp = SMTPStub(latency=smtp_latency)
+        self.repository = MemoryArticleRepository()
+        self._saved: Dict[str, Any] = {}
+
+    def __enter__(self):
+        self.smtp.start()
+        self._archive_dir = tempfile.mkdtemp(prefix="bench-archive-")
+        settings = {
+            "SMTP_SERVER": "127.0.0.1",
+            "SMTP_PORT": str(self.smtp.port),
+            "SMTP_STARTTLS": "false",
+            "SENDER_EMAIL": "bench@localhost",
+            "SENDER_PASSWORD": "",
+            # Anything archived during a run stays out of the working tree
+            "ARCHIVE_DIR": self._archive_dir
+        }
+        self._environ = {name: os.environ.get(name) for name in settings}
+        os.environ.update(settings)
+        self._saved = {
+            "get": fetcher.requests.get,
+            "save_feed_cache": fetcher.save_feed_cache,
+            "feed_cache": dict(fetcher._feed_cache)
+        }
+        fetcher.requests.get = self.feeds.get
+        # Every run parses the fixtures in full and leaves feed_cache.json alone
+        fetcher.save_feed_cache = lambda *args, **kwargs: None
+        fetcher._feed_cache.clear()
+        set_repository(self.repository)
+        # Keys remembered from earlier runs would hide the fixtures from the fresh store
+        recent_keys.clear()
+        llm.set_model(self.model)
+        whatsapp.set_transport(self.transport)
+        return self
+
+    def __exit__(self, *exc_info):
+        fetcher.requests.get = self._saved["get"]
+        fetcher.save_feed_cache = self._saved["save_feed_cache"]
+        fetcher._feed_cache.clear()
+        fetcher._feed_cache.update(self._saved["feed_cache"])
+        for name, value in self._environ.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        shutil.rmtree(self._archive_dir, ignore_errors=True)
+        self.smtp.stop()
+        return False
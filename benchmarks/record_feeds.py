@@ -0,0 +1,94 @@
+# 📁 app/benchmarks/record_feeds.py
+# Writes one RSS fixture per RSS_FEEDS source into benchmarks/fixtures/feeds,
+# used by the offline benchmarks instead of the live publishers.
+# Usage: python -m benchmarks.record_feeds            (record the live feeds)
+#        python -m benchmarks.record_feeds --synthetic (no network: generate them)
+
+import argparse, json, os, random, re
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+import requests
+
+from scraping.fetcher import RSS_FEEDS
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FEED_FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures", "feeds")
+ARTICLE_FIXTURE = os.path.join(os.path.dirname(BENCH_DIR), "article.json")
+
+def fixture_name(source: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", source.lower()).strip("_") + ".xml"
+
+def fixture_path(source: str) -> str:
+    return os.path.join(FEED_FIXTURE_DIR, fixture_name(source))
+
+def record_live(timeout: float):
+    for source, url in RSS_FEEDS.items():
+        try:
+            response = requests.get(url, timeout=timeout, headers={"User-Agent": "TaazaKhabar/1.0"})
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"  ✗ {source}: {e}")
+            continue
+        with open(fixture_path(source), "wb") as f:
+            f.write(response.content)
+        print(f"  ✓ {source}: {len(response.content) // 1024} KB")
+
+# Summary styles vary by publisher: empty (as in article.json), plain text,
+# inline markup with images and links, or embedded scripts / comments
+SUMMARY_STYLES = ["empty", "plain", "inline", "plain", "inline", "complex", "empty"]
+
+def synthetic_summary(style: str, title: str, link: str, rng: random.Random) -> str:
+    sentence = f"{title}. Officials said more details would follow after the review, and reactions poured in from across the country."
+    if style == "empty":
+        return ""
+    if style == "plain":
+        return sentence
+    if style == "inline":
+        return (f'<p><img src="{link}.jpg" alt="{escape(title, {chr(34): "&quot;"})}" width="{rng.choice([300, 600])}" /></p>'
+                f'<p>{escape(sentence)} <a href="{link}?utm_source=rss&amp;utm_medium=feed">Read more</a></p>')
+    return f'<div class="story"><!-- ad slot --><script>window.ad = {rng.randint(1, 99)};</script><p>{escape(sentence)}</p></div>'
+
+def record_synthetic(entries: int, seed: int):
+    """Deterministic stand-ins built from the article.json titles"""
+    with open(ARTICLE_FIXTURE, encoding="utf-8") as f:
+        titles = [a["title"] for a in json.load(f)]
+    start = datetime(2025, 9, 17, 12, 0, tzinfo=timezone.utc)
+    for index, (source, url) in enumerate(RSS_FEEDS.items()):
+        rng = random.Random(seed + index)
+        style = SUMMARY_STYLES[index % len(SUMMARY_STYLES)]
+        domain = re.sub(r"^https?://(www\.)?", "", url).split("/")[0]
+        items = []
+        for i in range(entries):
+            title = f"{rng.choice(titles)} ({source} #{i})"
+            link = f"https://{domain}/news/{index}-{i}"
+            published = format_datetime(start - timedelta(minutes=7 * i + index))
+            summary = synthetic_summary(style, title, link, rng)
+            items.append(
+                f"    <item>\n      <title>{escape(title)}</title>\n      <link>{link}</link>\n"
+                f"      <description>{escape(summary)}</description>\n      <pubDate>{published}</pubDate>\n    </item>\n"
+            )
+        document = (
+            f'<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0">\n  <channel>\n'
+            f"    <title>{escape(source)}</title>\n    <link>{url}</link>\n{''.join(items)}  </channel>\n</rss>\n"
+        )
+        with open(fixture_path(source), "w", encoding="utf-8") as f:
+            f.write(document)
+        print(f"  ✓ {source}: {entries} synthetic entries ({style} summaries)")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--entries", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=17)
+    parser.add_argument("--timeout", type=float, default=10)
+    args = parser.parse_args()
+    os.makedirs(FEED_FIXTURE_DIR, exist_ok=True)
+    if args.synthetic:
+        record_synthetic(args.entries, args.seed)
+    else:
+        record_live(args.timeout)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# 📁 app/benchmarks/smtp_stub.py
+# Minimal local SMTP server for load tests: accepts and discards mail.
+# Speaks just enough SMTP for smtplib (no STARTTLS/AUTH), so run the app with
+# SMTP_SERVER=127.0.0.1 SMTP_PORT=<port> SMTP_STARTTLS=false.
+# aiosmtpd's Sink handler works as a drop-in alternative if it is installed.
+
+import socketserver, threading, time
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, *lines: str):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        # One write per reply so multi-line responses don't stall on Nagle / delayed ACK
+        self.wfile.write("".join(line + "\r\n" for line in lines).encode())
+        self.wfile.flush()
+
+    def handle(self):
+        self.server.connections += 1
+        self._reply("220 localhost stub ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self._reply("250-localhost", "250 SIZE 10485760")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                self._reply("250 OK")
+            elif command == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                self.server.messages += 1
+                self._reply("250 OK queued")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    """Threaded sink SMTP server; `latency` adds a delay before every reply to mimic a remote server"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        super().__init__((host, port), _SMTPHandler)
+        self.latency = latency
+        self.messages = 0
+        self.connections = 0
+        self._thread = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+if __name__ == "__main__":
+    stub = SMTPStub(port=1025).start()
+    print(f"SMTP stub listening on 127.0.0.1:{stub.port} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        stub.stop()
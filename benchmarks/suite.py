@@ -0,0 +1,86 @@
+# 📁 app/benchmarks/suite.py
+# Runs the micro-benchmarks and HTTP load scenarios offline and compares them
+# with the saved baseline. Numbers are machine-dependent: re-save the baseline
+# on the machine that runs the comparison.
+# Usage: python -m benchmarks.suite [--save-baseline] [--tolerance 0.25] [--fail-on-regression]
+
+import argparse, json, os, platform, sys
+from datetime import datetime
+
+from benchmarks import load, micro
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+def flatten(results):
+    """{"micro.get_news_50": ms, "load.GET /articles.p99_ms": ms, ...}"""
+    flat = {f"micro.{name}": value for name, value in results["micro"].items()}
+    for scenario, metrics in results["load"].items():
+        for metric in ("p50_ms", "p99_ms", "throughput_rps"):
+            flat[f"load.{scenario}.{metric}"] = metrics[metric]
+    return flat
+
+def regressions(current, baseline, tolerance: float):
+    found = []
+    for key, value in flatten(current).items():
+        previous = flatten(baseline).get(key)
+        if not previous:
+            continue
+        # Throughput should not drop; everything else is a latency and should not grow
+        change = (previous - value) / previous if key.endswith("throughput_rps") else (value - previous) / previous
+        if change > tolerance:
+            found.append((key, previous, value, change))
+    return found
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    print("Micro-benchmarks (ms per call)")
+    micro_results = micro.run(args.repeat)
+    for name, ms in micro_results.items():
+        print(f"  {name:28s} {ms:9.3f}")
+
+    print(f"HTTP load ({args.requests} requests, concurrency {args.concurrency})")
+    load_results = load.run(args.requests, args.concurrency)
+    for name, r in load_results.items():
+        print(f"  {name:18s} p50 {r['p50_ms']:8.2f} ms   p99 {r['p99_ms']:8.2f} ms   "
+              f"{r['throughput_rps']:8.1f} req/s   errors {r['errors']}")
+
+    results = {
+        "recorded_at": datetime.utcnow().isoformat(),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "settings": {"repeat": args.repeat, "requests": args.requests, "concurrency": args.concurrency},
+        "micro": micro_results,
+        "load": load_results
+    }
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("No baseline saved yet; run with --save-baseline")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    found = regressions(results, baseline, args.tolerance)
+    if not found:
+        print(f"No regressions beyond {args.tolerance:.0%} of the baseline")
+        return
+    print(f"Regressions beyond {args.tolerance:.0%} of the baseline:")
+    for key, previous, value, change in found:
+        print(f"  {key:40s} {previous:10.3f} -> {value:10.3f}  ({change:+.0%})")
+    if args.fail_on_regression:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
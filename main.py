@@ -1,36 +1,77 @@
+# Load .env before the app modules are imported: many of them read their
+# settings from the environment at import time
+from dotenv import load_dotenv
+load_dotenv()
+# Also try loading from parent directory
+load_dotenv("../.env")
+
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
-from routes.news import router
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from routes.news import router, ensure_indexes
 from routes.about import router2
-from scraping import fetcher
+from routes.search import router3
+from routes.digests import router4
+from routes.archive import router5
+from scraping.scheduler import scheduler
+from scraping.fetcher import shutdown_parse_pool
+from storage.articles import get_repository
+from services import llm
+from services.mailer import mail_queue, missing_config
+from services import job_state, whatsapp
+from services.whatsapp import split_into_chunks
+from services.digest import format_articles_for_email, whatsapp_message_parts
+from search.index import article_index, warm_from_repository
+from services.chat_format import build_chat_prompt, format_chat_response, SectionParser
+from services import metrics
+from services.log import configure_logging
 from typing import List, Dict, Any
+from contextlib import asynccontextmanager
 
 import google.generativeai as genai
+import asyncio
 import os
-from dotenv import load_dotenv
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import requests
 import json
-from datetime import datetime
+import logging
 
-load_dotenv()
-# Also try loading from parent directory
-load_dotenv("../.env")
+configure_logging()
+logger = logging.getLogger("main")
 
 # Debug environment loading
-print("=== Environment Debug ===")
-print(f"Current working directory: {os.getcwd()}")
-print(f"GEMINI_API_KEY loaded: {bool(os.getenv('GEMINI_API_KEY'))}")
-print(f"SENDER_EMAIL: {os.getenv('SENDER_EMAIL')}")
-print(f"SENDER_PASSWORD exists: {bool(os.getenv('SENDER_PASSWORD'))}")
-print("========================")
+logger.debug("Environment loaded", extra={
+    "cwd": os.getcwd(),
+    "gemini_api_key": bool(os.getenv("GEMINI_API_KEY")),
+    "sender_email": bool(os.getenv("SENDER_EMAIL")),
+    "sender_password": bool(os.getenv("SENDER_PASSWORD"))
+})
 
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
-app = FastAPI(title="Taaza Khabar")
+# Number of stored articles retrieved into each chat prompt
+CHAT_CONTEXT_K = int(os.getenv("CHAT_CONTEXT_K", "5"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Connect the shared article store once, off the event loop
+    await asyncio.to_thread(get_repository().connect)
+    # Index builds and the one-time content-key backfill can take a while on a
+    # large collection; run them off the event loop without delaying startup
+    app.state.index_setup = asyncio.create_task(asyncio.to_thread(ensure_indexes))
+    # Build the retrieval index from stored articles without delaying startup
+    app.state.index_warmup = asyncio.create_task(asyncio.to_thread(warm_from_repository, get_repository()))
+    # Keep the article buffer warm in the background so reads never wait on publishers;
+    # ingestion only touches the search index once the warm-up is done
+    scheduler.start(warmup=app.state.index_warmup)
+    mail_queue.start()
+    yield
+    await scheduler.stop()
+    shutdown_parse_pool()
+    await asyncio.to_thread(mail_queue.stop)
+    await whatsapp.close_transport()
+    get_repository().close()
+
+app = FastAPI(title="Taaza Khabar", lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -40,21 +81,23 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Per-route latency histogram for /metrics
+app.add_middleware(metrics.MetricsMiddleware)
 
-@app.get("/articles")
-def get_all_articles():
-    if fetcher.mongodb_available and fetcher.collection is not None:
-        articles = list(fetcher.collection.find({}, {"_id": 0}))  # exclude MongoDB _id
-        return {"articles": articles}
-    return {"articles": []}
+@app.get("/metrics")
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
 
 @app.post("/scrape")
-def scrape_and_store(n: int = 20):
-    result = fetcher.get_news(n)
+async def scrape_and_store(n: int = 20):
+    # Explicit "refresh now"; joins the background run if one is already in flight
+    result = await scheduler.refresh(n)
     return {
         "message": result.get("message", f"Scraped {result.get('total', 0)} articles"),
         "articles": result.get("articles", []),
-        "total": result.get("total", 0)
+        "total": result.get("total", 0),
+        "cache": result.get("cache", {"hits": 0, "misses": 0}),
+        "ingest": result.get("ingest", {"known": 0, "new": 0, "duplicate": 0, "failed": 0, "archived": 0})
     }
 
 # Request body models
@@ -73,280 +116,134 @@ class WhatsAppRequest(BaseModel):
 @app.post("/chat")
 async def chat(request: ChatRequest):
     try:
-        model = genai.GenerativeModel("gemini-2.5-flash")
-        
-        # Enhanced prompt for concise, clear responses
-        enhanced_prompt = f"""
-        Please provide a clear and concise response to the following query.
-        Follow these guidelines:
-        - Be direct and to the point
-        - Use simple, plain text only (no markdown formatting)
-        - Keep responses under 5 sentences when possible
-        - Use simple bullet points with dashes (-)
-        - Do not use bold, italic, or any special formatting
-        - Skip unnecessary introductions
-        - Focus on the most relevant information
-        - Write in plain text without asterisks, underscores, or special characters
-        
-        Query: {request.query}
-        
-        Respond in plain text that's easy to read.
-        """
-        
-        response = model.generate_content(enhanced_prompt)
-        
-        # Clean up the response text - remove all markdown formatting
-        clean_text = response.text.strip()
-        
-        # Remove markdown headers
-        clean_text = clean_text.replace('## ', '').replace('### ', '').replace('# ', '')
-        
-        # Remove bold formatting
-        clean_text = clean_text.replace('**', '')
-        
-        # Remove italic formatting
-        clean_text = clean_text.replace('*', '')
-        
-        # Remove other common markdown elements
-        clean_text = clean_text.replace('_', '')
-        clean_text = clean_text.replace('`', '')
-        
-        # Clean up extra whitespace
-        import re
-        clean_text = re.sub(r'\n\s*\n', '\n\n', clean_text)  # Multiple newlines to double
-        clean_text = re.sub(r' +', ' ', clean_text)  # Multiple spaces to single
-        
-        # Parse and structure the response
-        formatted_response = {
-            "text": clean_text,
-            "formatted": True,
-            "sections": parse_response_sections(clean_text)
-        }
-        
-        return formatted_response
+        # Identical questions share one cached / in-flight Gemini call
+        return await llm.cached_call(llm.normalize_query(request.query), lambda: answer_chat(request.query))
     except Exception as e:
         return {"error": str(e)}
 
-def parse_response_sections(text):
-    """Parse the response text into structured sections"""
-    sections = []
-    lines = text.split('\n')
-    current_section = {"type": "paragraph", "content": []}
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            if current_section["content"]:
-                # Only add paragraph if it has content
-                if any(part.strip() for part in current_section["content"]):
-                    sections.append(current_section)
-                current_section = {"type": "paragraph", "content": []}
-            continue
-            
-        # Check for bullet points (simplified for cleaner output)
-        if line.startswith(('- ', '• ', '* ')):
-            if current_section["type"] != "bullet_list":
-                if current_section["content"] and any(part.strip() for part in current_section["content"]):
-                    sections.append(current_section)
-                current_section = {"type": "bullet_list", "content": []}
-            current_section["content"].append(line[2:])
-        else:
-            # Regular paragraph text
-            if current_section["type"] != "paragraph":
-                if current_section["content"]:
-                    sections.append(current_section)
-                current_section = {"type": "paragraph", "content": []}
-            current_section["content"].append(line)
-    
-    # Add the last section
-    if current_section["content"]:
-        sections.append(current_section)
-    
-    return sections
+def retrieve_context(query: str):
+    """Top matching stored articles for a chat query, as compact prompt snippets"""
+    return article_index.search(query, k=CHAT_CONTEXT_K)
 
-def format_articles_for_email(articles):
-    """Format articles for email content"""
-    email_content = """
-    <html>
-    <head>
-        <style>
-            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
-            .header { background: #667eea; color: white; padding: 20px; text-align: center; }
-            .article { border: 1px solid #ddd; margin: 20px 0; padding: 15px; border-radius: 8px; }
-            .source { background: #667eea; color: white; padding: 5px 10px; border-radius: 15px; font-size: 12px; }
-            .title { color: #1e293b; font-size: 18px; font-weight: bold; margin: 10px 0; }
-            .summary { color: #64748b; margin: 10px 0; }
-            .link { color: #667eea; text-decoration: none; }
-            .footer { text-align: center; color: #64748b; margin-top: 30px; }
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>📰 Your News Update from Taaza Khabar</h1>
-            <p>Here are your selected news articles</p>
-        </div>
-    """
-    
-    for article in articles:
-        email_content += f"""
-        <div class="article">
-            <span class="source">{article.get('source', 'Unknown')}</span>
-            <h2 class="title">{article.get('title', 'No Title')}</h2>
-            <p class="summary">{article.get('summary', 'No summary available')}</p>
-            <p><strong>Published:</strong> {article.get('published', 'Unknown date')}</p>
-            <p><a href="{article.get('link', '#')}" class="link" target="_blank">Read Full Article →</a></p>
-        </div>
-        """
+async def answer_chat(query: str):
+    # Retrieval takes the index lock and generation runs on the LLM pool, so neither blocks the event loop
+    context = await asyncio.to_thread(retrieve_context, query)
+    response_text = await llm.generate(build_chat_prompt(query, context))
     
-    email_content += """
-        <div class="footer">
-            <p>Powered by Taaza Khabar - Intelligent News Without Overload</p>
-            <p>This email was sent because you requested news updates through our platform.</p>
-        </div>
-    </body>
-    </html>
-    """
-    
-    return email_content
+    # Clean up the response text and parse it into sections
+    return format_chat_response(response_text)
 
-def format_articles_for_whatsapp(articles):
-    """Format articles for WhatsApp message"""
-    message = "📰 *Your News Update from Taaza Khabar*\n\n"
-    
-    for i, article in enumerate(articles, 1):
-        message += f"*{i}. {article.get('title', 'No Title')}*\n"
-        message += f"📍 Source: {article.get('source', 'Unknown')}\n"
-        message += f"📅 {article.get('published', 'Unknown date')}\n\n"
-        message += f"{article.get('summary', 'No summary available')}\n\n"
-        if article.get('link'):
-            message += f"🔗 Read more: {article.get('link')}\n\n"
-        message += "─────────────────\n\n"
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Stream the answer as Server-Sent Events: `delta` per cleaned line, `section` as each one closes, then `done`"""
+    cache_key = llm.normalize_query(request.query)
     
-    message += "Powered by Taaza Khabar 🤖\n"
-    message += "Intelligent News Without Overload"
+    async def events():
+        cached = llm.response_cache.get(cache_key)
+        if cached is not None:
+            for section in cached["sections"]:
+                yield sse_event("section", section)
+            yield sse_event("done", cached)
+            return
+        
+        parser = SectionParser(clean=True)
+        raw_text = ""
+        try:
+            context = await asyncio.to_thread(retrieve_context, request.query)
+            prompt = build_chat_prompt(request.query, context)
+            async for chunk in llm.stream_generate(prompt):
+                raw_text += chunk
+                sections = parser.feed(chunk)
+                # Deltas are whole cleaned lines, so markdown split across chunks never leaks through
+                for line in parser.lines:
+                    yield sse_event("delta", {"text": line})
+                for section in sections:
+                    yield sse_event("section", section)
+            sections = parser.close()
+            for line in parser.lines:
+                yield sse_event("delta", {"text": line})
+            for section in sections:
+                yield sse_event("section", section)
+        except Exception as e:
+            yield sse_event("error", {"error": str(e)})
+            return
+        
+        # Final payload matches /chat, and warms its cache
+        result = format_chat_response(raw_text)
+        llm.response_cache.set(cache_key, result)
+        yield sse_event("done", result)
     
-    return message
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.post("/send-email")
 async def send_email(request: EmailRequest):
     try:
-        # Email configuration from environment variables
-        smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        smtp_port = int(os.getenv("SMTP_PORT", "587"))
-        sender_email = os.getenv("SENDER_EMAIL")
-        sender_password = os.getenv("SENDER_PASSWORD")
+        config_error = missing_config()
+        if config_error:
+            raise HTTPException(status_code=500, detail=config_error)
         
-        print(f"Debug - SENDER_EMAIL: {sender_email}")
-        print(f"Debug - SENDER_PASSWORD exists: {bool(sender_password)}")
-        print(f"Debug - SMTP_SERVER: {smtp_server}")
-        print(f"Debug - SMTP_PORT: {smtp_port}")
-        
-        if not sender_email or not sender_password:
-            raise HTTPException(
-                status_code=500, 
-                detail=f"Email configuration not found. SENDER_EMAIL: {bool(sender_email)}, SENDER_PASSWORD: {bool(sender_password)}"
-            )
-        
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = f"📰 News Update from Taaza Khabar - {len(request.articles)} Articles"
-        msg['From'] = sender_email
-        msg['To'] = request.email
-        
-        # Create HTML content
+        subject = f"📰 News Update from Taaza Khabar - {len(request.articles)} Articles"
         html_content = format_articles_for_email(request.articles)
-        html_part = MIMEText(html_content, 'html')
-        msg.attach(html_part)
         
-        # Send email
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(sender_email, sender_password)
-            server.send_message(msg)
+        # Delivery happens on the pooled SMTP workers; poll /send-email/{job_id} for the outcome
+        job_id = mail_queue.enqueue(request.email, subject, html_content, on_done=lambda job: job_state.save("mail", job))
+        queued = mail_queue.job(job_id)
+        if queued is not None and job_state.shared():
+            # Any worker may get the poll, so the state lives in the shared store too
+            await asyncio.to_thread(job_state.save, "mail", queued, False)
         
         return {
             "success": True,
-            "message": f"Successfully sent {len(request.articles)} articles to {request.email}"
+            "job_id": job_id,
+            "status": "queued",
+            "message": f"Queued {len(request.articles)} articles for {request.email}"
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to send email: {str(e)}")
 
+@app.get("/send-email/{job_id}")
+def email_status(job_id: str):
+    # Another worker's job when it isn't ours (multi-worker mode)
+    job = mail_queue.job(job_id) or job_state.load("mail", job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Email job not found")
+    return job
+
 @app.post("/send-whatsapp")
 async def send_whatsapp(request: WhatsAppRequest):
     try:
-        # WhatsApp API configuration from environment variables
-        whatsapp_token = os.getenv("WHATSAPP_TOKEN")
-        whatsapp_phone_id = os.getenv("WHATSAPP_PHONE_ID")
-        
-        # For testing purposes, if WhatsApp credentials are not configured,
-        # we'll simulate the sending and save to a file instead
-        if not whatsapp_token or not whatsapp_phone_id or whatsapp_token == "your_whatsapp_business_api_token":
-            # Format message
-            message_text = format_articles_for_whatsapp(request.articles)
-            
-            # Save to file for testing
-            timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-            filename = f"whatsapp_message_{timestamp}.txt"
-            
-            try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(f"WhatsApp Message for: {request.whatsapp}\n")
-                    f.write(f"Timestamp: {datetime.now()}\n")
-                    f.write("="*50 + "\n\n")
-                    f.write(message_text)
-                
-                return {
-                    "success": True,
-                    "message": f"WhatsApp simulation: Message saved to {filename}. {len(request.articles)} articles prepared for {request.whatsapp}",
-                    "simulation": True
-                }
-            except Exception as e:
-                print(f"Error saving WhatsApp simulation: {e}")
-                return {
-                    "success": True,
-                    "message": f"WhatsApp simulation successful: {len(request.articles)} articles prepared for {request.whatsapp}",
-                    "simulation": True
-                }
-        
-        # Real WhatsApp API implementation
-        # Format message
-        message_text = format_articles_for_whatsapp(request.articles)
+        # Long digests go out as several messages, split between articles
+        chunks = split_into_chunks(*whatsapp_message_parts(request.articles))
         
-        # WhatsApp Business API endpoint
-        url = f"https://graph.facebook.com/v17.0/{whatsapp_phone_id}/messages"
-        
-        headers = {
-            "Authorization": f"Bearer {whatsapp_token}",
-            "Content-Type": "application/json"
-        }
+        # Graph API when WHATSAPP_TOKEN / WHATSAPP_PHONE_ID are configured, otherwise the file stand-in
+        transport = whatsapp.get_transport()
+        result = await transport.send(request.whatsapp, chunks)
         
-        # Clean phone number (remove non-digits except +)
-        phone_number = ''.join(c for c in request.whatsapp if c.isdigit() or c == '+')
-        if not phone_number.startswith('+'):
-            phone_number = '+' + phone_number
-        
-        payload = {
-            "messaging_product": "whatsapp",
-            "to": phone_number,
-            "type": "text",
-            "text": {
-                "body": message_text
-            }
-        }
-        
-        response = requests.post(url, headers=headers, json=payload)
-        
-        if response.status_code == 200:
+        if transport.simulation:
+            if result.get("filename"):
+                message = f"WhatsApp simulation: Message saved to {result['filename']}. {len(request.articles)} articles prepared for {request.whatsapp}"
+            else:
+                message = f"WhatsApp simulation successful: {len(request.articles)} articles prepared for {request.whatsapp}"
             return {
                 "success": True,
-                "message": f"Successfully sent {len(request.articles)} articles to {request.whatsapp}"
+                "message": message,
+                "simulation": True,
+                "chunks": len(chunks)
             }
-        else:
-            raise HTTPException(
-                status_code=response.status_code,
-                detail=f"WhatsApp API error: {response.text}"
-            )
+        
+        return {
+            "success": True,
+            "message": f"Successfully sent {len(request.articles)} articles to {request.whatsapp}",
+            "chunks": len(chunks)
+        }
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to send WhatsApp message: {str(e)}")
@@ -355,8 +252,12 @@ async def send_whatsapp(request: WhatsAppRequest):
 # Include other routers
 app.include_router(router)
 app.include_router(router2)
+app.include_router(router3)
+app.include_router(router4)
+app.include_router(router5)
 
 
+# Development server; run serve.py for multiple worker processes
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app",host="127.0.0.1", port=8000, reload=True)
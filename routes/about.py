@@ -1,13 +1,16 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from services.http_cache import cached_json
 
 router2=APIRouter()
 
+ABOUT = {
+    "project": "Taaza Khabar",
+    "description": "An API that fetches the latest Indian news articles using RSS feeds.",
+    "developer": "Smit Satani",
+    "version": "1.0.0"
+}
+
 @router2.get("/About")        
-def About():
-
-    return {
-        "project": "Taaza Khabar",
-        "description": "An API that fetches the latest Indian news articles using RSS feeds.",
-        "developer": "Smit Satani",
-        "version": "1.0.0"
-    }
\ No newline at end of file
+def About(request: Request):
+
+    return cached_json(request, ABOUT["version"], lambda: ABOUT)
\ No newline at end of file
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Query
+from typing import List, Optional
+from routes.search import to_timestamp
+from storage.archive import HOT_DAYS, article_archive
+from datetime import datetime, timezone
+
+router5 = APIRouter()
+
+MAX_ARCHIVE_LIMIT = 500
+
+def to_datetime(value: Optional[str], name: str) -> Optional[datetime]:
+    timestamp = to_timestamp(value, name)
+    return datetime.fromtimestamp(timestamp, timezone.utc) if timestamp is not None else None
+
+@router5.get("/archive")
+def query_archive(
+    source: Optional[List[str]] = Query(None),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0
+):
+    """Articles older than the hot window, newest first, read only from the matching day segments.
+
+    `since` is inclusive and `until` exclusive, as in /search.
+    """
+    limit = max(1, min(limit, MAX_ARCHIVE_LIMIT))
+    articles, segments = article_archive.query(
+        sources=source,
+        since=to_datetime(since, "since"),
+        until=to_datetime(until, "until"),
+        limit=limit,
+        offset=max(0, offset)
+    )
+    return {
+        "count": len(articles),
+        "limit": limit,
+        "offset": max(0, offset),
+        "segments_read": segments,
+        "hot_days": HOT_DAYS,
+        "articles": articles
+    }
@@ -0,0 +1,47 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import List, Dict, Any, Optional
+from scraping.scheduler import scheduler
+from services import broadcast, job_state
+from services.subscribers import get_segment
+
+router4 = APIRouter()
+
+class BroadcastRequest(BaseModel):
+    # Article selection: explicit articles, or the latest N from the ingestion buffer
+    articles: List[Dict[str, Any]] = []
+    latest: Optional[int] = None
+    # Recipients: explicit lists and/or a stored subscriber segment
+    emails: List[str] = []
+    whatsapp: List[str] = []
+    segment: Optional[str] = None
+
+@router4.post("/digests/broadcast")
+async def broadcast_digest(request: BroadcastRequest):
+    articles = request.articles
+    if not articles and request.latest:
+        articles = scheduler.latest(request.latest)["articles"]
+    if not articles:
+        raise HTTPException(status_code=400, detail="No articles selected")
+    
+    emails = list(request.emails)
+    numbers = list(request.whatsapp)
+    if request.segment:
+        try:
+            segment = get_segment(request.segment)
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"Subscriber segment not found: {request.segment}")
+        emails += segment["emails"]
+        numbers += segment["whatsapp"]
+    if not emails and not numbers:
+        raise HTTPException(status_code=400, detail="No recipients given")
+    
+    return broadcast.start_broadcast(articles, emails, numbers)
+
+@router4.get("/digests/broadcast/{broadcast_id}")
+def broadcast_progress(broadcast_id: str):
+    # Started by another worker when it isn't ours (multi-worker mode)
+    result = broadcast.progress(broadcast_id) or job_state.load("broadcast", broadcast_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Broadcast not found")
+    return result
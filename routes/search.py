@@ -0,0 +1,42 @@
+from fastapi import APIRouter, HTTPException, Query
+from datetime import datetime, timezone
+from typing import List, Optional
+from search.index import article_index
+
+router3 = APIRouter()
+
+MAX_SEARCH_LIMIT = 100
+
+def to_timestamp(value: Optional[str], name: str) -> Optional[float]:
+    """Parse an ISO date or datetime query parameter (UTC if no offset) into a UNIX timestamp"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} date: {value}")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+@router3.get("/search")
+def search_articles(
+    q: Optional[str] = None,
+    source: Optional[List[str]] = Query(None),
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0
+):
+    """Keyword search over ingested articles with source facets and a published date range"""
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    result = article_index.query(
+        q=q.strip() if q else None,
+        sources=source,
+        since=to_timestamp(since, "since"),
+        until=to_timestamp(until, "until"),
+        limit=limit,
+        offset=max(0, offset)
+    )
+    result["query"] = q
+    return result
@@ -0,0 +1,45 @@
+# 📁 app/scraping/backfill.py
+# One-off: add the parsed `published_at` field to articles stored before it existed.
+# Usage: python -m scraping.backfill
+
+import logging
+from datetime import datetime
+from pymongo import UpdateOne
+from scraping.fetcher import parse_published
+from storage.articles import get_repository, MongoArticleRepository
+
+BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+def backfill_published_at(collection, batch_size: int = BATCH_SIZE) -> int:
+    updated = 0
+    operations = []
+    cursor = collection.find(
+        {"published_at": {"$exists": False}},
+        {"_id": 1, "published": 1, "fetched_at": 1}
+    )
+    for doc in cursor:
+        fetched_at = doc.get("fetched_at") or datetime.utcnow().isoformat()
+        published_at = parse_published(doc.get("published", "Unknown"), fetched_at)
+        operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"published_at": published_at}}))
+        if len(operations) >= batch_size:
+            updated += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        updated += collection.bulk_write(operations, ordered=False).modified_count
+    return updated
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from services.log import configure_logging
+    load_dotenv()
+    configure_logging()
+    
+    repository = get_repository()
+    if not isinstance(repository, MongoArticleRepository) or not repository.connect():
+        logger.warning("MongoDB not available, nothing to backfill")
+    else:
+        count = backfill_published_at(repository.collection)
+        repository.ensure_indexes()
+        logger.info("Backfilled published_at", extra={"articles": count})
@@ -0,0 +1,174 @@
+# 📁 app/scraping/dedup.py
+
+import hashlib, os, re, threading
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+# MinHash / LSH settings: 8 bands of 4 rows catch pairs with Jaccard similarity above ~0.6
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = 0.5
+SUMMARY_TOKENS = 40  # Only the lead of the summary, so long summaries don't drown the headline
+RECENT_KEYS_SIZE = int(os.getenv("RECENT_KEYS_SIZE", "100000"))
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "for", "at", "by", "with",
+    "from", "as", "is", "are", "was", "were", "be", "been", "has", "have", "had", "it",
+    "its", "this", "that", "after", "over", "into", "says", "said", "amid", "about"
+}
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+def _permutations(count: int) -> List[Tuple[int, int]]:
+    # Deterministic coefficients so fingerprints are stable across restarts
+    perms = []
+    for i in range(count):
+        seed = hashlib.blake2b(f"perm-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(seed[:8], "big") % (_MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(seed[8:], "big") % _MERSENNE_PRIME
+        perms.append((a, b))
+    return perms
+
+_PERMS = _permutations(NUM_PERM)
+
+def normalize_tokens(title: str, summary: str = "") -> set:
+    """Lowercased word set of the title plus the lead of the summary, minus stopwords"""
+    tokens = _TOKEN_RE.findall((title or "").lower())
+    tokens += _TOKEN_RE.findall((summary or "").lower())[:SUMMARY_TOKENS]
+    return {t for t in tokens if t not in STOPWORDS and len(t) > 1}
+
+def minhash(tokens: set) -> Tuple[int, ...]:
+    if not tokens:
+        return tuple([_MAX_HASH] * NUM_PERM)
+    hashes = [_hash64(t) for t in tokens]
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMS
+    )
+
+def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+class StoryClusterIndex:
+    """In-memory MinHash LSH index that groups near-duplicate stories into clusters.
+
+    Each lookup only compares against the handful of signatures that share an
+    LSH band bucket, so it stays constant-time as the index grows. The oldest
+    signatures are evicted once `max_entries` is reached.
+    """
+
+    def __init__(self, max_entries: int = 200_000, threshold: float = SIMILARITY_THRESHOLD):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        self._entries: Dict[int, Tuple[Tuple[int, ...], str]] = {}
+        self._order = deque()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _bands(signature):
+        return [(band, signature[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+    def assign(self, title: str, summary: str = "") -> Tuple[str, bool]:
+        """Return (cluster_id, is_new_cluster) for a story, indexing it if it is new"""
+        tokens = normalize_tokens(title, summary)
+        if not tokens:
+            return hashlib.blake2b((title or "").encode("utf-8"), digest_size=8).hexdigest(), True
+        signature = minhash(tokens)
+        bands = self._bands(signature)
+
+        with self._lock:
+            best_id, best_score = None, 0.0
+            seen = set()
+            for key in bands:
+                for entry_id in self._buckets.get(key, ()):
+                    if entry_id in seen:
+                        continue
+                    seen.add(entry_id)
+                    score = similarity(signature, self._entries[entry_id][0])
+                    if score > best_score:
+                        best_id, best_score = entry_id, score
+
+            if best_id is not None and best_score >= self.threshold:
+                cluster_id = self._entries[best_id][1]
+                if best_score == 1.0:
+                    # Same story seen again; no need to index another copy
+                    return cluster_id, False
+                is_new = False
+            else:
+                cluster_id = hashlib.blake2b(" ".join(sorted(tokens)).encode("utf-8"), digest_size=8).hexdigest()
+                is_new = True
+
+            self._add(signature, bands, cluster_id)
+            return cluster_id, is_new
+
+    def _add(self, signature, bands, cluster_id):
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (signature, cluster_id)
+        self._order.append((entry_id, bands))
+        for key in bands:
+            self._buckets.setdefault(key, []).append(entry_id)
+
+        while len(self._order) > self.max_entries:
+            old_id, old_bands = self._order.popleft()
+            del self._entries[old_id]
+            for key in old_bands:
+                bucket = self._buckets.get(key)
+                if bucket:
+                    bucket.remove(old_id)
+                    if not bucket:
+                        del self._buckets[key]
+
+class RecentKeys:
+    """Bounded set of content keys the article store already holds.
+
+    get_news checks it before cleaning and parsing an entry, so feeds that
+    mostly repeat what was ingested last time cost a hash per entry. The
+    oldest keys are forgotten first; the store's unique index still catches
+    anything that slips past.
+    """
+
+    def __init__(self, maxlen: int = RECENT_KEYS_SIZE):
+        self.maxlen = maxlen
+        self._keys = set()
+        self._order = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def add_many(self, keys: Iterable[str]):
+        with self._lock:
+            for key in keys:
+                if key in self._keys:
+                    continue
+                self._keys.add(key)
+                self._order.append(key)
+            while len(self._order) > self.maxlen:
+                self._keys.discard(self._order.popleft())
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+            self._order.clear()
+
+# Shared index used by get_news
+story_index = StoryClusterIndex()
+# Keys of articles already stored, shared by get_news runs
+recent_keys = RecentKeys()
@@ -0,0 +1,160 @@
+# 📁 app/scraping/health.py
+# Per-source feed health: recent success rate and latency, a circuit breaker
+# that backs off from failing feeds, and a poll interval learned from how
+# often each feed actually publishes.
+
+import os, random, threading, time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+BREAKER_THRESHOLD = int(os.getenv("SOURCE_BREAKER_THRESHOLD", "3"))  # consecutive failures before opening
+BREAKER_BASE_SECONDS = float(os.getenv("SOURCE_BREAKER_BASE_SECONDS", "60"))
+BREAKER_MAX_SECONDS = float(os.getenv("SOURCE_BREAKER_MAX_SECONDS", "3600"))
+MIN_POLL_SECONDS = float(os.getenv("SOURCE_MIN_POLL_SECONDS", "120"))
+MAX_POLL_SECONDS = float(os.getenv("SOURCE_MAX_POLL_SECONDS", "3600"))
+EWMA_ALPHA = 0.3  # weight of the newest observation in the running averages
+PUBLISH_SAMPLE = 20  # newest entries used to estimate a feed's publish interval
+
+def _ewma(previous: Optional[float], value: float) -> float:
+    return value if previous is None else EWMA_ALPHA * value + (1 - EWMA_ALPHA) * previous
+
+def publish_interval(timestamps: Iterable[float]) -> Optional[float]:
+    """Mean gap in seconds between a feed's newest entries, or None with fewer than two"""
+    newest = sorted(timestamps, reverse=True)[:PUBLISH_SAMPLE]
+    if len(newest) < 2:
+        return None
+    return max(1.0, (newest[0] - newest[-1]) / (len(newest) - 1))
+
+class SourceHealth:
+    """Rolling state for one feed. Times are time.time() seconds."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.success_rate = 1.0
+        self.latency: Optional[float] = None
+        self.publish_interval: Optional[float] = None
+        self.newest_entry: Optional[float] = None
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.last_attempt: Optional[float] = None
+        self.last_success: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.next_poll = 0.0
+
+    @property
+    def state(self) -> str:
+        if self.consecutive_failures < BREAKER_THRESHOLD:
+            return "closed"
+        # Once the backoff has passed, a single trial request decides whether it closes again
+        return "open" if time.time() < self.open_until else "half_open"
+
+    def allows_request(self, now: float) -> bool:
+        return now >= self.open_until
+
+    def due(self, now: float) -> bool:
+        return now >= self.next_poll
+
+    def poll_interval(self) -> float:
+        if self.publish_interval is None:
+            return MIN_POLL_SECONDS
+        return min(MAX_POLL_SECONDS, max(MIN_POLL_SECONDS, self.publish_interval))
+
+    def score(self, now: float) -> float:
+        """Higher is better: reliable, fast, and recently publishing"""
+        speed = 1.0 / (1.0 + (self.latency or 0.0))
+        age_hours = (now - self.newest_entry) / 3600 if self.newest_entry else 24.0
+        freshness = 1.0 / (1.0 + max(0.0, age_hours))
+        return max(0.01, self.success_rate) * speed * (0.5 + freshness)
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        def iso(ts):
+            return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts else None
+        return {
+            "state": self.state,
+            "success_rate": round(self.success_rate, 3),
+            "latency_seconds": round(self.latency, 3) if self.latency is not None else None,
+            "publish_interval_seconds": round(self.publish_interval) if self.publish_interval else None,
+            "poll_interval_seconds": round(self.poll_interval()),
+            "consecutive_failures": self.consecutive_failures,
+            "retry_at": iso(self.open_until) if self.open_until > now else None,
+            "next_poll": iso(self.next_poll),
+            "last_success": iso(self.last_success),
+            "last_error": self.last_error,
+            "newest_entry": iso(self.newest_entry),
+            "score": round(self.score(now), 4)
+        }
+
+class SourceHealthRegistry:
+    def __init__(self):
+        self._sources: Dict[str, SourceHealth] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> SourceHealth:
+        with self._lock:
+            health = self._sources.get(name)
+            if health is None:
+                health = self._sources[name] = SourceHealth(name)
+            return health
+
+    def reset(self):
+        """Forget all state, so every source is healthy and due (benchmarks)"""
+        with self._lock:
+            self._sources.clear()
+
+    def record_success(self, name: str, latency: float, timestamps: Optional[List[float]] = None):
+        """A completed fetch; `timestamps` are the entries' publish times when the body was new"""
+        now = time.time()
+        health = self.get(name)
+        with self._lock:
+            health.success_rate = _ewma(health.success_rate, 1.0)
+            health.latency = _ewma(health.latency, latency)
+            health.consecutive_failures = 0
+            health.open_until = 0.0
+            health.last_attempt = health.last_success = now
+            health.last_error = None
+            if timestamps:
+                interval = publish_interval(timestamps)
+                if interval is not None:
+                    health.publish_interval = _ewma(health.publish_interval, interval)
+                health.newest_entry = max(timestamps)
+            health.next_poll = now + health.poll_interval()
+
+    def record_failure(self, name: str, error: str):
+        now = time.time()
+        health = self.get(name)
+        with self._lock:
+            health.success_rate = _ewma(health.success_rate, 0.0)
+            health.consecutive_failures += 1
+            health.last_attempt = now
+            health.last_error = error
+            if health.consecutive_failures >= BREAKER_THRESHOLD:
+                # Exponential backoff with jitter so broken feeds aren't retried in lockstep
+                backoff = BREAKER_BASE_SECONDS * 2 ** (health.consecutive_failures - BREAKER_THRESHOLD)
+                health.open_until = now + min(BREAKER_MAX_SECONDS, backoff) * random.uniform(0.8, 1.2)
+                health.next_poll = health.open_until
+
+    def rank(self, names: Iterable[str]) -> List[str]:
+        """Sources whose breaker allows a request, in score-weighted random order.
+
+        Weighted sampling without replacement (key = u ** (1 / score)) keeps
+        some variety while putting healthy, fast, fresh feeds first.
+        """
+        now = time.time()
+        keyed = []
+        for name in names:
+            health = self.get(name)
+            if health.allows_request(now):
+                keyed.append((random.random() ** (1.0 / health.score(now)), name))
+        keyed.sort(reverse=True)
+        return [name for _, name in keyed]
+
+    def seconds_until_next_poll(self, names: Iterable[str]) -> float:
+        now = time.time()
+        return max(0.0, min((self.get(name).next_poll - now for name in names), default=0.0))
+
+    def snapshot(self, names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        return {name: self.get(name).snapshot(now) for name in names}
+
+# Shared by get_news, the scheduler and /sources/health
+source_health = SourceHealthRegistry()
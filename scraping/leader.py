@@ -0,0 +1,60 @@
+# 📁 app/scraping/leader.py
+# Leader election between worker processes on one host. Whoever holds an
+# exclusive lock on the lease file runs ingestion; the OS drops the lock when
+# that process exits, so another worker takes over on its next attempt.
+
+import logging, os
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+class FileLease:
+    """Non-blocking exclusive lock on a file, held until release() or process exit"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> bool:
+        """Take the lease if no other process holds it; True if we hold it afterwards"""
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(fd)
+            return False
+        # Holder's pid, for whoever is debugging which worker is scraping
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        logger.info("Acquired ingestion lease", extra={"path": self.path, "pid": os.getpid()})
+        return True
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        os.close(self._fd)
+        self._fd = None
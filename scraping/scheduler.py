@@ -0,0 +1,256 @@
+# 📁 app/scraping/scheduler.py
+
+import asyncio, logging, os
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+
+from scraping.fetcher import RSS_FEEDS, get_news
+from scraping.health import source_health
+from scraping.leader import FileLease
+from scraping.snapshot import SharedSnapshot
+from search.index import article_index
+from services.metrics import ERRORS
+from storage.archive import ARCHIVE_MAX_DAYS_PER_RUN, archive_expired, hot_window_start
+from storage.articles import get_repository
+
+logger = logging.getLogger(__name__)
+
+# Background ingestion settings
+INGEST_INTERVAL = float(os.getenv("INGEST_INTERVAL_SECONDS", "300"))
+MIN_INGEST_INTERVAL = float(os.getenv("MIN_INGEST_INTERVAL_SECONDS", "30"))
+INGEST_BATCH = int(os.getenv("INGEST_BATCH_SIZE", "50"))
+BUFFER_SIZE = int(os.getenv("ARTICLE_BUFFER_SIZE", "500"))
+# Multi-worker mode (see serve.py): INGEST_LEADER_LOCK / ARTICLE_SNAPSHOT_PATH are read in start()
+LEADER_RETRY_SECONDS = float(os.getenv("LEADER_RETRY_SECONDS", "15"))
+SNAPSHOT_POLL_SECONDS = float(os.getenv("SNAPSHOT_POLL_SECONDS", "1"))
+ARCHIVE_INTERVAL = float(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+class ArticleBuffer:
+    """Fixed-size buffer of the most recently ingested articles, newest last.
+
+    Re-ingesting an article already in the buffer moves it to the front
+    instead of storing it twice; the oldest articles fall off once the
+    buffer is full.
+    """
+
+    def __init__(self, maxlen: int = BUFFER_SIZE):
+        self.maxlen = maxlen
+        self._items: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def extend(self, articles: List[Dict[str, Any]]):
+        for article in articles:
+            key = (article.get("source"), article.get("title", "").lower())
+            self._items.pop(key, None)
+            self._items[key] = article
+        while len(self._items) > self.maxlen:
+            self._items.popitem(last=False)
+
+    def latest(self, n: int) -> List[Dict[str, Any]]:
+        result = []
+        for article in reversed(self._items.values()):
+            if len(result) >= n:
+                break
+            result.append(article)
+        return result
+
+class IngestionScheduler:
+    """Refreshes feeds in the background and serves reads from an in-memory buffer.
+
+    With several worker processes, only the worker holding the ingestion
+    lease scrapes. It publishes its buffer to a shared snapshot file after
+    every run; the other workers reload their buffer from that file and
+    keep trying for the lease in case the leader exits.
+    """
+
+    def __init__(self, interval: float = INGEST_INTERVAL, batch_size: int = INGEST_BATCH, buffer_size: int = BUFFER_SIZE):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.buffer = ArticleBuffer(buffer_size)
+        self.last_result: Optional[Dict[str, Any]] = None
+        # Bumped after every ingestion; cached read responses are rebuilt when it changes
+        self.version = 0
+        self._inflight: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self.lease: Optional[FileLease] = None
+        self.snapshot: Optional[SharedSnapshot] = None
+        self._leader_sources: Optional[Dict[str, Any]] = None
+        self._last_archive: Optional[float] = None
+        self._ttl_ready = False
+        # Search index warm-up from the store; ingestion waits for it (see _index_ready)
+        self._warmup: Optional[asyncio.Future] = None
+
+    @property
+    def refreshing(self) -> bool:
+        return self._inflight is not None and not self._inflight.done()
+
+    @property
+    def leader(self) -> bool:
+        """Whether this process runs ingestion (always, unless leader election is configured)"""
+        return self.lease is None or self.lease.held
+
+    async def _index_ready(self):
+        """Wait for the warm-up to finish before adding anything to the search index.
+
+        Doc ids follow insertion order and the MAX_SCAN cut-off assumes that is
+        publish order, so fresh articles must not land before the stored ones.
+        """
+        if self._warmup is not None:
+            # wait() rather than await: a cancelled ingestion must not cancel the warm-up
+            await asyncio.wait([self._warmup])
+
+    async def _ingest(self, n: int) -> Dict[str, Any]:
+        await self._index_ready()
+        result = await asyncio.to_thread(get_news, n)
+        self.buffer.extend(result.get("articles", []))
+        self.last_result = result
+        self.version += 1
+        if self.snapshot is not None:
+            try:
+                await asyncio.to_thread(
+                    self.snapshot.publish, self.buffer.latest(self.buffer.maxlen), source_health.snapshot(RSS_FEEDS)
+                )
+            except OSError as e:
+                ERRORS.inc(component="snapshot")
+                logger.warning("Failed to publish article snapshot", extra={"error": str(e)})
+        return result
+
+    async def _load_snapshot(self) -> bool:
+        """Replace the buffer with the leader's latest snapshot if it changed"""
+        if self.snapshot is None:
+            return False
+        snapshot = await asyncio.to_thread(self.snapshot.load_if_changed)
+        if snapshot is None:
+            return False
+        articles = snapshot["articles"]
+        self._leader_sources = snapshot["sources"]
+        buffer = ArticleBuffer(self.buffer.maxlen)
+        buffer.extend(reversed(articles))
+        self.buffer = buffer
+        self.last_result = {"total": len(articles), "message": "Loaded the ingestion leader's snapshot"}
+        self.version += 1
+        # Keep chat retrieval in step with what the leader ingested (oldest first, like warm-up)
+        await self._index_ready()
+        await asyncio.to_thread(article_index.add_many, articles[::-1])
+        await asyncio.to_thread(article_index.evict_before, hot_window_start().timestamp())
+        return True
+
+    async def refresh(self, n: Optional[int] = None) -> Dict[str, Any]:
+        """Run an ingestion now, or join the one already in flight"""
+        if not self.leader:
+            # Only the leader scrapes; other workers answer from its latest snapshot
+            await self._load_snapshot()
+            return {**self.latest(n or self.batch_size), "message": "Ingestion runs in another worker; served its latest snapshot"}
+        if not self.refreshing:
+            self._inflight = asyncio.create_task(self._ingest(n or self.batch_size))
+        # Shield so a cancelled client request doesn't abort a shared run
+        return await asyncio.shield(self._inflight)
+
+    def sources(self) -> Dict[str, Dict[str, Any]]:
+        """Per-source health: our own when we ingest, else the leader's as of its latest snapshot"""
+        if not self.leader and self._leader_sources:
+            return self._leader_sources
+        return source_health.snapshot(RSS_FEEDS)
+
+    def latest(self, n: int) -> Dict[str, Any]:
+        articles = self.buffer.latest(n)
+        return {
+            "total": len(articles),
+            "articles": articles,
+            "message": f"Served {len(articles)} articles from cache"
+        }
+
+    async def _follow(self):
+        """Track the leader's snapshot until it is time to try for the lease again"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + LEADER_RETRY_SECONDS
+        while loop.time() < deadline:
+            try:
+                await self._load_snapshot()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                ERRORS.inc(component="snapshot")
+                logger.exception("Failed to load article snapshot")
+            await asyncio.sleep(SNAPSHOT_POLL_SECONDS)
+
+    async def _run(self):
+        while True:
+            if self.lease is not None and not self.lease.held:
+                if not self.lease.acquire():
+                    await self._follow()
+                    continue
+                # New leader: start from the previous leader's articles, then take over ingestion
+                await self._load_snapshot()
+            try:
+                result = await self.refresh()
+                logger.info("Background ingestion finished", extra={"articles": result.get("total", 0), "cache": result.get("cache")})
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                ERRORS.inc(component="ingestion")
+                logger.exception("Background ingestion failed")
+            await self._archive_if_due()
+            await asyncio.sleep(self.next_delay())
+
+    async def _archive_if_due(self):
+        """Move days past the hot window out of the article store (leader only, every ARCHIVE_INTERVAL)"""
+        now = asyncio.get_running_loop().time()
+        if self._last_archive is not None and now - self._last_archive < ARCHIVE_INTERVAL:
+            return
+        self._last_archive = now
+        repository = get_repository()
+        try:
+            # Until the TTL backstop exists, archive the whole backlog in one go
+            max_days = ARCHIVE_MAX_DAYS_PER_RUN if self._ttl_ready else None
+            stats = await asyncio.to_thread(archive_expired, repository, None, None, max_days)
+            if stats["caught_up"] and not self._ttl_ready:
+                # Only now: a TTL index on an unarchived backlog would delete it first
+                await asyncio.to_thread(repository.ensure_ttl_index)
+                self._ttl_ready = True
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            ERRORS.inc(component="archive")
+            logger.exception("Archival failed")
+            return
+        # Search and chat only cover the hot window too, so the index stays bounded
+        evicted = await asyncio.to_thread(article_index.evict_before, hot_window_start().timestamp())
+        if evicted:
+            logger.info("Evicted archived articles from the search index", extra={"articles": evicted})
+        if stats["articles"]:
+            # /articles pages change when old articles leave the store
+            self.version += 1
+
+    def next_delay(self) -> float:
+        """Wake when the next feed is due to be polled, but at least every `interval` seconds"""
+        return min(self.interval, max(MIN_INGEST_INTERVAL, source_health.seconds_until_next_poll(RSS_FEEDS)))
+
+    def start(self, warmup: Optional[asyncio.Future] = None):
+        """Start background ingestion; `warmup` is the search index warm-up task, if one is running"""
+        if warmup is not None:
+            self._warmup = warmup
+        lock_path = os.getenv("INGEST_LEADER_LOCK")
+        if lock_path and self.lease is None:
+            self.lease = FileLease(lock_path)
+            self.snapshot = SharedSnapshot(os.getenv("ARTICLE_SNAPSHOT_PATH", "article_snapshot.json"))
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        for task in (self._loop_task, self._inflight):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._loop_task = None
+        self._inflight = None
+        if self.lease is not None:
+            self.lease.release()
+
+# Shared scheduler started from the FastAPI lifespan
+scheduler = IngestionScheduler()
@@ -0,0 +1,62 @@
+# 📁 app/scraping/snapshot.py
+# Latest-articles snapshot shared between worker processes. The ingestion
+# leader writes the buffer and its per-source health to a file after every
+# run (atomically, via rename); the other workers memory-map it when it
+# changes and serve reads from their own parsed copy, never from the database.
+
+import json, logging, mmap, os, tempfile
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.http_cache import dumps
+
+try:
+    import orjson
+except ImportError:  # Falls back to the stdlib decoder
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+class SharedSnapshot:
+    def __init__(self, path: str):
+        self.path = path
+        self._identity: Optional[Tuple[int, int, int]] = None
+
+    def publish(self, articles: List[Dict[str, Any]], sources: Optional[Dict[str, Any]] = None):
+        """Replace the snapshot with `articles` (newest first) and the leader's source health"""
+        payload = {"published_at": datetime.now(timezone.utc).isoformat(), "articles": articles, "sources": sources or {}}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(dumps(payload))
+            # Readers see either the old file or the new one, never a partial write
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def load_if_changed(self) -> Optional[Dict[str, Any]]:
+        """The snapshot ({"articles": [...], "sources": {...}}) if it changed since the last call, else None"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if identity == self._identity or not stat.st_size:
+            return None
+        try:
+            with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if orjson is not None:
+                    with memoryview(mapped) as view:
+                        payload = orjson.loads(view)
+                else:
+                    payload = json.loads(mapped[:])
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to read article snapshot", extra={"path": self.path, "error": str(e)})
+            return None
+        self._identity = identity
+        return {"articles": payload.get("articles", []), "sources": payload.get("sources", {})}
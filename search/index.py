@@ -0,0 +1,335 @@
+# 📁 app/search/index.py
+# In-process BM25 index over article title + summary with source and date
+# filters, fed incrementally by get_news. Postings are compact arrays so 100k+ articles stay cheap to hold.
+
+import bisect, heapq, logging, math, re, threading
+from array import array
+from collections import Counter
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple
+
+from scraping.dedup import STOPWORDS
+
+logger = logging.getLogger(__name__)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_CHARS = 300
+# Postings longer than this are never scanned in full: they are probed for
+# documents already matched by rarer terms, or only their newest entries are read
+MAX_SCAN = 4000
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS and len(t) > 1]
+
+def _published_ts(article: Dict[str, Any]) -> float:
+    value = article.get("published_at") or article.get("fetched_at")
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return 0.0
+    if not isinstance(value, datetime):
+        return 0.0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+class ArticleIndex:
+    """BM25-ranked inverted index over article titles and summaries.
+
+    Documents are numbered in insertion order; each term's postings are a
+    pair of arrays (doc ids, term frequencies). Titles count twice so a
+    headline match outranks a passing mention in a summary.
+    """
+
+    def __init__(self):
+        self.docs: List[Dict[str, Any]] = []
+        self._keys: Dict[str, int] = {}
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._doc_len = array("I")
+        self._total_len = 0
+        # Facet / filter columns, one entry per document
+        self._doc_source = array("H")
+        self._source_ids: Dict[str, int] = {}
+        self._source_names: List[str] = []
+        self._by_time: List[Tuple[float, int]] = []
+        self.source_counts: Counter = Counter()
+        self._lock = threading.RLock()
+        self.version = 0
+        # One eviction at a time; while it runs, add() notes the terms it touches here
+        self._evict_lock = threading.Lock()
+        self._touched: Optional[set] = None
+
+    def __len__(self):
+        return len(self.docs)
+
+    @staticmethod
+    def doc_key(article: Dict[str, Any]) -> str:
+        return article.get("link") or f"{article.get('source')}|{article.get('title')}"
+
+    def add(self, article: Dict[str, Any]) -> bool:
+        """Index one article; returns False if it was already indexed"""
+        key = self.doc_key(article)
+        title = article.get("title", "")
+        summary = article.get("summary", "") or ""
+        terms: Dict[str, int] = {}
+        for term in tokenize(title) * 2 + tokenize(summary):
+            terms[term] = terms.get(term, 0) + 1
+
+        with self._lock:
+            if key in self._keys:
+                return False
+            doc_id = len(self.docs)
+            self._keys[key] = doc_id
+            source = article.get("source") or "Unknown"
+            published_ts = _published_ts(article)
+            self.docs.append({
+                "source": source,
+                "title": title,
+                "summary": summary[:SNIPPET_CHARS],
+                "link": article.get("link"),
+                "published": article.get("published"),
+                "published_ts": published_ts
+            })
+            source_id = self._source_ids.get(source)
+            if source_id is None:
+                source_id = self._source_ids[source] = len(self._source_names)
+                self._source_names.append(source)
+            self._doc_source.append(source_id)
+            self.source_counts[source] += 1
+            bisect.insort(self._by_time, (published_ts, doc_id))
+            length = sum(terms.values())
+            self._doc_len.append(length)
+            self._total_len += length
+            for term, tf in terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("I"), array("H"))
+                postings[0].append(doc_id)
+                postings[1].append(min(tf, 65535))
+            if self._touched is not None:
+                self._touched.update(terms)
+            self.version += 1
+            return True
+
+    def add_many(self, articles: List[Dict[str, Any]]) -> int:
+        return sum(1 for article in articles if self.add(article))
+
+    def scores(self, query: str, max_scan: Optional[int] = MAX_SCAN) -> Dict[int, float]:
+        """BM25 score for documents matching the query.
+
+        Terms are processed rarest first. A very common term only adds to
+        documents already matched by rarer terms; if every term is common,
+        just its newest `max_scan` postings are scored. This keeps a query at
+        a few thousand postings however large the index grows. With
+        `max_scan=None` every matching document is scored.
+        """
+        with self._lock:
+            n_docs = len(self.docs)
+            postings_list = [self._postings[t] for t in set(tokenize(query)) if t in self._postings]
+            if not postings_list or not n_docs:
+                return {}
+            postings_list.sort(key=lambda postings: len(postings[0]))
+            
+            norm = BM25_K1 * (1 - BM25_B)
+            scale = BM25_K1 * BM25_B * n_docs / self._total_len
+            doc_len = self._doc_len
+            scores: Dict[int, float] = {}
+            
+            for doc_ids, tfs in postings_list:
+                df = len(doc_ids)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                weight = idf * (BM25_K1 + 1)
+                
+                if max_scan is not None and df > max_scan and scores:
+                    # Probe: doc ids are appended in order, so each lookup is a bisect
+                    for doc_id in list(scores):
+                        i = bisect.bisect_left(doc_ids, doc_id)
+                        if i < df and doc_ids[i] == doc_id:
+                            tf = tfs[i]
+                            scores[doc_id] += weight * tf / (tf + norm + scale * doc_len[doc_id])
+                    continue
+                
+                start = max(0, df - max_scan) if max_scan is not None else 0
+                get = scores.get
+                for doc_id, tf in zip(doc_ids[start:], tfs[start:]):
+                    scores[doc_id] = get(doc_id, 0.0) + weight * tf / (tf + norm + scale * doc_len[doc_id])
+            return scores
+
+    def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        """Top-k articles for a query, best first, each with its BM25 `score`"""
+        scores = self.scores(query)
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [dict(self.docs[doc_id], score=round(score, 4)) for doc_id, score in best]
+
+    def query(self, q: Optional[str] = None, sources: Optional[List[str]] = None,
+              since: Optional[float] = None, until: Optional[float] = None,
+              limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """Keyword + facet search.
+
+        With `q`, results are ranked by BM25 over every matching document
+        (not the capped set chat retrieval uses), so `total`, the facets and
+        the date filters are exact; without it, newest first.
+        `since` / `until` are UNIX timestamps bounding published time. Source
+        facet counts ignore the source filter itself so clients can show the
+        other options; with no query or date filter they come straight from
+        the precomputed per-source counters.
+        """
+        with self._lock:
+            if q:
+                scores = self.scores(q, max_scan=None)
+                candidates = scores.keys()
+            else:
+                scores = None
+                lo = bisect.bisect_left(self._by_time, (since, -1)) if since is not None else 0
+                hi = bisect.bisect_left(self._by_time, (until, -1)) if until is not None else len(self._by_time)
+                candidates = [doc_id for _, doc_id in reversed(self._by_time[lo:hi])]
+
+            docs = self.docs
+            if q and (since is not None or until is not None):
+                candidates = [
+                    doc_id for doc_id in candidates
+                    if (since is None or docs[doc_id]["published_ts"] >= since)
+                    and (until is None or docs[doc_id]["published_ts"] < until)
+                ]
+
+            # Facets over the keyword/date matches, before the source filter
+            if not q and since is None and until is None:
+                facets = dict(self.source_counts)
+            else:
+                doc_source = self._doc_source
+                names = self._source_names
+                counts = Counter(doc_source[doc_id] for doc_id in candidates)
+                facets = {names[source_id]: count for source_id, count in counts.items()}
+
+            if sources:
+                wanted = {self._source_ids[name] for name in sources if name in self._source_ids}
+                doc_source = self._doc_source
+                candidates = [doc_id for doc_id in candidates if doc_source[doc_id] in wanted]
+
+            total = len(candidates)
+            if scores is not None:
+                ranked = heapq.nlargest(offset + limit, candidates, key=scores.__getitem__)[offset:]
+                results = [dict(docs[doc_id], score=round(scores[doc_id], 4)) for doc_id in ranked]
+            else:
+                results = [dict(docs[doc_id]) for doc_id in list(candidates)[offset:offset + limit]]
+
+            return {
+                "total": total,
+                "count": len(results),
+                "results": results,
+                "facets": {"source": facets}
+            }
+
+    def evict_before(self, timestamp: float) -> int:
+        """Drop articles published before `timestamp` (archived out of the store); returns how many.
+
+        Survivors are renumbered in their existing order, so doc ids still
+        follow publish time and every postings array stays sorted. The pruned
+        arrays are built from a copy without holding the lock, so searches
+        and adds carry on meanwhile; documents added in the mean time are
+        carried over when the new arrays are swapped in.
+        """
+        with self._evict_lock:
+            with self._lock:
+                if not self._by_time or self._by_time[0][0] >= timestamp:
+                    return 0
+                n = len(self.docs)
+                docs = self.docs[:n]
+                doc_len = self._doc_len[:n]
+                doc_source = self._doc_source[:n]
+                by_time = list(self._by_time)
+                # Postings only ever grow at the end, so ids below n can be read without the lock
+                postings = list(self._postings.items())
+                self._touched = set()
+
+            try:
+                keep = [doc_id for doc_id, doc in enumerate(docs) if doc["published_ts"] >= timestamp]
+                removed = n - len(keep)
+                if not removed:
+                    return 0
+                new_ids = array("l", [-1]) * n
+                for new_id, old_id in enumerate(keep):
+                    new_ids[old_id] = new_id
+
+                kept_docs = [docs[doc_id] for doc_id in keep]
+                keys = {self.doc_key(doc): doc_id for doc_id, doc in enumerate(kept_docs)}
+                kept_len = array("I", (doc_len[doc_id] for doc_id in keep))
+                kept_source = array("H", (doc_source[doc_id] for doc_id in keep))
+                source_counts = Counter(self._source_names[source_id] for source_id in kept_source)
+                kept_by_time = [(ts, new_ids[doc_id]) for ts, doc_id in by_time if doc_id < n and new_ids[doc_id] >= 0]
+                pruned = {}
+                for term, (doc_ids, tfs) in postings:
+                    end = bisect.bisect_left(doc_ids, n)
+                    kept_ids, kept_tfs = array("I"), array("H")
+                    for doc_id, tf in zip(doc_ids[:end], tfs[:end]):
+                        new_id = new_ids[doc_id]
+                        if new_id >= 0:
+                            kept_ids.append(new_id)
+                            kept_tfs.append(tf)
+                    if kept_ids:
+                        pruned[term] = (kept_ids, kept_tfs)
+
+                with self._lock:
+                    # Carry over what was added while we were building
+                    for doc_id in range(n, len(self.docs)):
+                        doc = self.docs[doc_id]
+                        new_id = doc_id - removed
+                        kept_docs.append(doc)
+                        keys[self.doc_key(doc)] = new_id
+                        kept_len.append(self._doc_len[doc_id])
+                        kept_source.append(self._doc_source[doc_id])
+                        source_counts[doc["source"]] += 1
+                        bisect.insort(kept_by_time, (doc["published_ts"], new_id))
+                    for term in self._touched:
+                        doc_ids, tfs = self._postings[term]
+                        start = bisect.bisect_left(doc_ids, n)
+                        if start == len(doc_ids):
+                            continue
+                        target = pruned.get(term)
+                        if target is None:
+                            target = pruned[term] = (array("I"), array("H"))
+                        target[0].extend(doc_id - removed for doc_id in doc_ids[start:])
+                        target[1].extend(tfs[start:])
+
+                    self.docs = kept_docs
+                    self._keys = keys
+                    self._doc_len = kept_len
+                    self._total_len = sum(kept_len)
+                    self._doc_source = kept_source
+                    self.source_counts = source_counts
+                    self._by_time = kept_by_time
+                    self._postings = pruned
+                    self.version += 1
+                return removed
+            finally:
+                with self._lock:
+                    self._touched = None
+
+    def load(self, articles) -> int:
+        """Bulk-index an iterable of stored articles, oldest first (used to warm the index at startup)"""
+        added = 0
+        for article in articles:
+            if self.add(article):
+                added += 1
+        return added
+
+# Shared index fed by get_news and read by /chat and /search
+article_index = ArticleIndex()
+
+def warm_from_repository(repository, index: ArticleIndex = article_index) -> int:
+    """Index everything already in the article store; run once at startup, off the event loop"""
+    if not repository.available:
+        return 0
+    try:
+        # The store streams newest first; index oldest first so doc ids follow
+        # publish time, which the MAX_SCAN cut-off in scores() relies on
+        added = index.load(reversed(list(repository.stream())))
+        logger.info("Search index warmed", extra={"articles": added})
+        return added
+    except Exception as e:
+        logger.warning("Failed to warm search index", extra={"error": str(e)})
+        return 0
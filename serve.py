@@ -0,0 +1,41 @@
+# 📁 app/serve.py
+# Production entry point: several uvicorn worker processes sharing one port.
+# One worker wins the ingestion lease and scrapes; the others serve reads
+# from the snapshot it publishes. `python main.py` stays the dev server.
+# Multiple workers need MongoDB: the in-process store isn't shared.
+# Usage: python serve.py [--workers N] [--host 0.0.0.0] [--port 8000]
+
+import argparse, os
+
+# Before reading WEB_CONCURRENCY and the pool settings below
+from dotenv import load_dotenv
+load_dotenv()
+load_dotenv("../.env")
+
+import uvicorn
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))))
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--access-log", action="store_true", help="log every request (per-route latency is already in /metrics)")
+    args = parser.parse_args()
+    workers = max(1, args.workers)
+
+    if workers > 1:
+        store = os.getenv("ARTICLE_STORE") or ("mongo" if os.getenv("MONGODB_URI") else "memory")
+        if store != "mongo":
+            # Each worker would read its own empty store, and job state couldn't be shared
+            parser.error("--workers > 1 needs MongoDB: set MONGODB_URI (and not ARTICLE_STORE=memory), or use --workers 1")
+        # Workers inherit these, so they agree on the lease and snapshot files
+        os.environ.setdefault("INGEST_LEADER_LOCK", os.path.abspath("ingest.lock"))
+        os.environ.setdefault("ARTICLE_SNAPSHOT_PATH", os.path.abspath("article_snapshot.json"))
+        # Each worker has its own Mongo client; split the connection budget instead of multiplying it
+        total_pool = int(os.getenv("MONGODB_TOTAL_POOL_SIZE", "100"))
+        os.environ.setdefault("MONGODB_POOL_SIZE", str(max(5, total_pool // workers)))
+
+    uvicorn.run("main:app", host=args.host, port=args.port, workers=workers, access_log=args.access_log)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# 📁 app/services/broadcast.py
+# Digest fan-out: render once per channel, dedupe recipients, deliver through
+# the pooled mail queue and a bounded set of concurrent WhatsApp sends.
+
+import asyncio, os, uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from services import job_state, mailer, whatsapp
+from services.digest import format_articles_for_email, whatsapp_message_parts
+from services.whatsapp import normalize_phone, split_into_chunks
+
+BROADCAST_CONCURRENCY = int(os.getenv("BROADCAST_CONCURRENCY", "8"))
+MAX_TRACKED_BROADCASTS = 1000
+# How often a running broadcast's progress is copied to the shared store (multi-worker mode)
+BROADCAST_SYNC_SECONDS = float(os.getenv("BROADCAST_SYNC_SECONDS", "2"))
+
+_broadcasts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_tasks = set()
+
+def dedupe_emails(emails: List[str]) -> List[str]:
+    seen = OrderedDict()
+    for email in emails:
+        email = (email or "").strip()
+        if email:
+            seen.setdefault(email.lower(), email)
+    return list(seen.values())
+
+def dedupe_numbers(numbers: List[str]) -> List[str]:
+    return list(OrderedDict.fromkeys(normalize_phone(n) for n in numbers if n and n.strip()))
+
+def start_broadcast(articles: List[Dict[str, Any]], emails: List[str], numbers: List[str]) -> Dict[str, Any]:
+    """Create a broadcast job and start delivering it in the background"""
+    emails = dedupe_emails(emails)
+    numbers = dedupe_numbers(numbers)
+    broadcast_id = uuid.uuid4().hex
+    job = {
+        "id": broadcast_id,
+        "status": "running",
+        "created_at": datetime.utcnow().isoformat(),
+        "finished_at": None,
+        "articles": len(articles),
+        "recipients": {}
+    }
+    for email in emails:
+        job["recipients"][f"email:{email}"] = {"channel": "email", "to": email, "status": "pending", "error": None}
+    for number in numbers:
+        job["recipients"][f"whatsapp:{number}"] = {"channel": "whatsapp", "to": number, "status": "pending", "error": None}
+
+    _broadcasts[broadcast_id] = job
+    while len(_broadcasts) > MAX_TRACKED_BROADCASTS:
+        _broadcasts.popitem(last=False)
+
+    task = asyncio.create_task(_run(job, articles, emails, numbers))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return progress(broadcast_id)
+
+async def _run(job: Dict[str, Any], articles, emails: List[str], numbers: List[str]):
+    recipients = job["recipients"]
+    if job_state.shared():
+        await asyncio.to_thread(job_state.save, "broadcast", progress(job["id"]))
+    try:
+        if emails:
+            config_error = mailer.missing_config()
+            # Rendered once for every recipient on the channel
+            subject = f"📰 News Update from Taaza Khabar - {len(articles)} Articles"
+            html_content = format_articles_for_email(articles)
+            for email in emails:
+                entry = recipients[f"email:{email}"]
+                if config_error:
+                    entry["status"], entry["error"] = "failed", config_error
+                    continue
+                entry["status"] = "queued"
+                # Tracked here rather than through the mail queue's job map, which only keeps recent jobs
+                mailer.mail_queue.enqueue(email, subject, html_content, on_done=_email_done(entry))
+
+        if numbers:
+            chunks = split_into_chunks(*whatsapp_message_parts(articles))
+            transport = whatsapp.get_transport()
+            semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+
+            async def deliver(number: str):
+                entry = recipients[f"whatsapp:{number}"]
+                async with semaphore:
+                    entry["status"] = "sending"
+                    try:
+                        await transport.send(number, chunks)
+                        entry["status"] = "sent"
+                    except Exception as e:
+                        entry["status"], entry["error"] = "failed", str(e)
+
+            await asyncio.gather(*(deliver(number) for number in numbers))
+    except Exception as e:
+        for entry in recipients.values():
+            if entry["status"] == "pending":
+                entry["status"], entry["error"] = "failed", str(e)
+    finally:
+        job["status"] = "dispatched"
+    if job_state.shared():
+        await _publish(job["id"])
+
+async def _publish(broadcast_id: str):
+    """Copy progress to the shared store until the broadcast completes, so any worker can answer polls"""
+    while True:
+        result = progress(broadcast_id)
+        if result is None:
+            return
+        await asyncio.to_thread(job_state.save, "broadcast", result)
+        if result["status"] == "completed":
+            return
+        await asyncio.sleep(BROADCAST_SYNC_SECONDS)
+
+def _email_done(entry: Dict[str, Any]):
+    def on_done(mail_job: Dict[str, Any]):
+        # Runs on an SMTP worker thread; a single update() so progress() never sees half of it
+        entry.update({"status": mail_job["status"], "error": mail_job["error"]})
+    return on_done
+
+def progress(broadcast_id: str) -> Optional[Dict[str, Any]]:
+    """Current per-recipient status"""
+    job = _broadcasts.get(broadcast_id)
+    if job is None:
+        return None
+
+    counts: Dict[str, int] = {}
+    recipients = []
+    for entry in list(job["recipients"].values()):
+        entry = dict(entry)
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        recipients.append(entry)
+
+    done = counts.get("sent", 0) + counts.get("failed", 0)
+    if job["status"] == "dispatched" and done == len(recipients):
+        job["status"] = "completed"
+        job["finished_at"] = job["finished_at"] or datetime.utcnow().isoformat()
+
+    return {
+        "id": job["id"],
+        "status": job["status"],
+        "created_at": job["created_at"],
+        "finished_at": job["finished_at"],
+        "articles": job["articles"],
+        "total": len(recipients),
+        "counts": counts,
+        "recipients": recipients
+    }
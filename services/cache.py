@@ -0,0 +1,56 @@
+# 📁 app/services/cache.py
+
+import threading, time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from services.metrics import CACHE_HITS, CACHE_MISSES
+
+_MISSING = object()
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds (ttl=None never expires).
+
+    A named cache also reports its hits and misses to /metrics.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None, name: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING:
+                value, expires_at = item
+                if expires_at is not None and expires_at <= time.monotonic():
+                    del self._data[key]
+                    item = _MISSING
+            if item is _MISSING:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+        if self.name:
+            (CACHE_MISSES if item is _MISSING else CACHE_HITS).inc(cache=self.name)
+        return default if item is _MISSING else value
+
+    def set(self, key: Hashable, value: Any):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,153 @@
+# 📁 app/services/chat_format.py
+# Prompt, markdown cleanup and sectioning for /chat. The section parser works
+# line by line so /chat/stream can emit sections as soon as they close.
+
+import re
+from typing import List, Dict, Any, Optional
+
+_MULTI_SPACE = re.compile(r" +")
+_BLANK_LINES = re.compile(r"\n\s*\n")
+_BULLET_PREFIXES = ('- ', '• ', '* ')
+CONTEXT_SUMMARY_CHARS = 200
+
+def format_context(articles: List[Dict[str, Any]]) -> str:
+    """Compact one-line-per-article news context for the prompt"""
+    lines = []
+    for article in articles:
+        summary = (article.get("summary") or "").strip().replace("\n", " ")
+        line = f"- [{article.get('source', 'Unknown')}, {article.get('published', 'Unknown date')}] {article.get('title', '')}"
+        if summary:
+            line += f": {summary[:CONTEXT_SUMMARY_CHARS]}"
+        lines.append(line)
+    return "\n".join(lines)
+
+def build_chat_prompt(query: str, context: Optional[List[Dict[str, Any]]] = None) -> str:
+    news_context = ""
+    if context:
+        news_context = f"""
+    Use these recent news articles if they are relevant to the query:
+{format_context(context)}
+"""
+    # Enhanced prompt for concise, clear responses
+    return f"""
+    Please provide a clear and concise response to the following query.
+    Follow these guidelines:
+    - Be direct and to the point
+    - Use simple, plain text only (no markdown formatting)
+    - Keep responses under 5 sentences when possible
+    - Use simple bullet points with dashes (-)
+    - Do not use bold, italic, or any special formatting
+    - Skip unnecessary introductions
+    - Focus on the most relevant information
+    - Write in plain text without asterisks, underscores, or special characters
+    {news_context}
+    Query: {query}
+
+    Respond in plain text that's easy to read.
+    """
+
+def clean_line(line: str) -> str:
+    """Strip markdown from a single line of model output"""
+    # Remove markdown headers
+    line = line.replace('## ', '').replace('### ', '').replace('# ', '')
+    # Remove bold / italic formatting and other common markdown elements
+    line = line.replace('**', '').replace('*', '').replace('_', '').replace('`', '')
+    # Multiple spaces to single
+    return _MULTI_SPACE.sub(' ', line)
+
+def clean_markdown(text: str) -> str:
+    """Strip markdown from a full response"""
+    clean_text = text.strip()
+    
+    # Remove markdown headers
+    clean_text = clean_text.replace('## ', '').replace('### ', '').replace('# ', '')
+    
+    # Remove bold / italic formatting and other common markdown elements
+    clean_text = clean_text.replace('**', '').replace('*', '').replace('_', '').replace('`', '')
+    
+    # Clean up extra whitespace
+    clean_text = _BLANK_LINES.sub('\n\n', clean_text)  # Multiple newlines to double
+    clean_text = _MULTI_SPACE.sub(' ', clean_text)  # Multiple spaces to single
+    return clean_text
+
+class SectionParser:
+    """Incremental version of parse_response_sections.
+
+    Feed it text in arbitrary chunks; each call returns the sections that
+    were closed by that chunk. close() flushes whatever is still open. With
+    clean=True each line is also run through clean_line, for raw model output.
+    `lines` holds the complete lines the last feed() / close() consumed, after
+    cleaning, so markup split across chunks is never passed on half-stripped.
+    """
+
+    def __init__(self, clean: bool = False):
+        self.clean = clean
+        self.lines: List[str] = []
+        self._pending = ""
+        self._current: Dict[str, Any] = {"type": "paragraph", "content": []}
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self._pending += chunk
+        self.lines = []
+        if '\n' not in self._pending:
+            return []
+        *lines, self._pending = self._pending.split('\n')
+        closed = []
+        for line in lines:
+            line = clean_line(line) if self.clean else line
+            self.lines.append(line + '\n')
+            closed.extend(self._add_line(line))
+        return closed
+
+    def close(self) -> List[Dict[str, Any]]:
+        closed = []
+        self.lines = []
+        if self._pending:
+            # The full-text cleaner strips before replacing, so trailing spaces never count as markup
+            last_line = self._pending.rstrip()
+            last_line = clean_line(last_line) if self.clean else last_line
+            self.lines.append(last_line)
+            closed.extend(self._add_line(last_line))
+            self._pending = ""
+        if self._current["content"]:
+            closed.append(self._current)
+        self._current = {"type": "paragraph", "content": []}
+        return closed
+
+    def _add_line(self, line: str) -> List[Dict[str, Any]]:
+        line = line.strip()
+        current = self._current
+        if not line:
+            if current["content"]:
+                self._current = {"type": "paragraph", "content": []}
+                return [current]
+            return []
+
+        # Check for bullet points (simplified for cleaner output)
+        if line.startswith(_BULLET_PREFIXES):
+            section_type, text = "bullet_list", line[2:]
+        else:
+            section_type, text = "paragraph", line
+
+        closed = []
+        if current["type"] != section_type:
+            if current["content"]:
+                closed.append(current)
+            current = self._current = {"type": section_type, "content": []}
+        current["content"].append(text)
+        return closed
+
+def parse_response_sections(text):
+    """Parse the response text into structured sections"""
+    parser = SectionParser()
+    sections = parser.feed(text)
+    sections.extend(parser.close())
+    return sections
+
+def format_chat_response(raw_text: str) -> Dict[str, Any]:
+    clean_text = clean_markdown(raw_text)
+    return {
+        "text": clean_text,
+        "formatted": True,
+        "sections": parse_response_sections(clean_text)
+    }
@@ -0,0 +1,80 @@
+# 📁 app/services/digest.py
+# Email and WhatsApp digest rendering from precompiled templates: one
+# fragment per article (HTML-escaped for email) and a single join, instead of
+# growing the message with repeated concatenation.
+
+from html import escape
+from typing import Any, Dict, List, Tuple
+
+EMAIL_HEADER = """
+    <html>
+    <head>
+        <style>
+            body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+            .header { background: #667eea; color: white; padding: 20px; text-align: center; }
+            .article { border: 1px solid #ddd; margin: 20px 0; padding: 15px; border-radius: 8px; }
+            .source { background: #667eea; color: white; padding: 5px 10px; border-radius: 15px; font-size: 12px; }
+            .title { color: #1e293b; font-size: 18px; font-weight: bold; margin: 10px 0; }
+            .summary { color: #64748b; margin: 10px 0; }
+            .link { color: #667eea; text-decoration: none; }
+            .footer { text-align: center; color: #64748b; margin-top: 30px; }
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>📰 Your News Update from Taaza Khabar</h1>
+            <p>Here are your selected news articles</p>
+        </div>
+    """
+
+EMAIL_FOOTER = """
+        <div class="footer">
+            <p>Powered by Taaza Khabar - Intelligent News Without Overload</p>
+            <p>This email was sent because you requested news updates through our platform.</p>
+        </div>
+    </body>
+    </html>
+    """
+
+WHATSAPP_HEADER = "📰 *Your News Update from Taaza Khabar*\n\n"
+
+WHATSAPP_FOOTER = "Powered by Taaza Khabar 🤖\nIntelligent News Without Overload"
+
+# The per-article templates are f-strings: compiled once with the module,
+# they render much faster than str.format on the same text.
+def email_fragment(article: Dict[str, Any]) -> str:
+    return f"""
+        <div class="article">
+            <span class="source">{escape(str(article.get('source', 'Unknown')))}</span>
+            <h2 class="title">{escape(str(article.get('title', 'No Title')))}</h2>
+            <p class="summary">{escape(str(article.get('summary', 'No summary available')))}</p>
+            <p><strong>Published:</strong> {escape(str(article.get('published', 'Unknown date')))}</p>
+            <p><a href="{escape(str(article.get('link', '#')), quote=True)}" class="link" target="_blank">Read Full Article →</a></p>
+        </div>
+        """
+
+def whatsapp_fragment(article: Dict[str, Any]) -> str:
+    """Everything after the "*{i}. " prefix, which depends on the article's position"""
+    link = article.get('link')
+    read_more = f"🔗 Read more: {link}\n\n" if link else ""
+    return (
+        f"{article.get('title', 'No Title')}*\n"
+        f"📍 Source: {article.get('source', 'Unknown')}\n"
+        f"📅 {article.get('published', 'Unknown date')}\n\n"
+        f"{article.get('summary', 'No summary available')}\n\n"
+        f"{read_more}─────────────────\n\n"
+    )
+
+def format_articles_for_email(articles: List[Dict[str, Any]]) -> str:
+    """Format articles for email content"""
+    return "".join([EMAIL_HEADER, *(email_fragment(article) for article in articles), EMAIL_FOOTER])
+
+def whatsapp_message_parts(articles: List[Dict[str, Any]]) -> Tuple[str, List[str], str]:
+    """Header, one block per article, and footer of the WhatsApp digest"""
+    blocks = [f"*{i}. " + whatsapp_fragment(article) for i, article in enumerate(articles, 1)]
+    return WHATSAPP_HEADER, blocks, WHATSAPP_FOOTER
+
+def format_articles_for_whatsapp(articles: List[Dict[str, Any]]) -> str:
+    """Format articles for WhatsApp message"""
+    header, blocks, footer = whatsapp_message_parts(articles)
+    return "".join([header, *blocks, footer])
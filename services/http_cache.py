@@ -0,0 +1,85 @@
+# 📁 app/services/http_cache.py
+# Rendered-response cache for the read endpoints. A payload is serialized,
+# hashed and gzipped once per data version; client polls are answered from
+# the cached bytes, or with a bare 304 when their ETag still matches.
+
+import gzip, hashlib, json, os
+from datetime import datetime
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from services.cache import TTLCache
+
+try:
+    import orjson
+except ImportError:  # Falls back to the stdlib encoder
+    orjson = None
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+GZIP_MIN_BYTES = int(os.getenv("GZIP_MIN_BYTES", "1024"))
+GZIP_LEVEL = 6
+
+def _default(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+def dumps(payload: Any) -> bytes:
+    """Compact JSON bytes; datetimes as ISO 8601, anything else unknown (ObjectId) via str()"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+class RenderedResponse:
+    __slots__ = ("version", "body", "gzipped", "etag")
+
+    def __init__(self, version: Hashable, payload: Any):
+        self.version = version
+        self.body = dumps(payload)
+        # Strong validator for the identity encoding; the gzip variant gets its own
+        self.etag = '"' + hashlib.blake2b(self.body, digest_size=16).hexdigest() + '"'
+        self.gzipped: Optional[bytes] = gzip.compress(self.body, GZIP_LEVEL) if len(self.body) >= GZIP_MIN_BYTES else None
+
+response_cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, name="response")
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+def respond(request: Request, rendered: RenderedResponse) -> Response:
+    use_gzip = rendered.gzipped is not None and "gzip" in request.headers.get("accept-encoding", "")
+    etag = rendered.etag[:-1] + '-gzip"' if use_gzip else rendered.etag
+    # Clients may reuse the body but must revalidate, which costs them one ETag comparison here
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(rendered.gzipped, media_type="application/json", headers=headers)
+    return Response(rendered.body, media_type="application/json", headers=headers)
+
+def cached_json(request: Request, version: Hashable, build: Callable[[], Any]) -> Response:
+    """Serve `build()` as JSON, re-running it only when `version` changes.
+
+    Entries are keyed by path and query string. Payloads carrying an "error"
+    key are sent but never cached.
+    """
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+    rendered = response_cache.get(key)
+    if rendered is None or rendered.version != version:
+        payload = build()
+        rendered = RenderedResponse(version, payload)
+        if not (isinstance(payload, dict) and "error" in payload):
+            response_cache.set(key, rendered)
+    return respond(request, rendered)
@@ -0,0 +1,42 @@
+# 📁 app/services/job_state.py
+# Mail job and broadcast state shared between worker processes. Each worker
+# tracks the jobs it runs in memory; with several workers (see serve.py) a
+# status poll can land on another one, so the state is also saved to the
+# article store, where any worker can read it.
+
+import logging, os
+from typing import Any, Dict, Optional
+
+from services.metrics import ERRORS
+from storage.articles import get_repository
+
+logger = logging.getLogger(__name__)
+
+def shared() -> bool:
+    """Whether other worker processes may be polling for our jobs (multi-worker mode)"""
+    return bool(os.getenv("INGEST_LEADER_LOCK"))
+
+def save(kind: str, job: Dict[str, Any], overwrite: bool = True):
+    """Publish a job's current state; blocking, so call it off the event loop.
+
+    overwrite=False is for the initial state, which must not replace a final
+    one saved first from another thread.
+    """
+    if not shared():
+        return
+    try:
+        get_repository().put_job(kind, job, overwrite)
+    except Exception as e:
+        ERRORS.inc(component="job_state")
+        logger.warning("Failed to save job state", extra={"kind": kind, "job_id": job.get("id"), "error": str(e)})
+
+def load(kind: str, job_id: str) -> Optional[Dict[str, Any]]:
+    """State saved by whichever worker runs the job, or None"""
+    if not shared():
+        return None
+    try:
+        return get_repository().get_job(kind, job_id)
+    except Exception as e:
+        ERRORS.inc(component="job_state")
+        logger.warning("Failed to load job state", extra={"kind": kind, "job_id": job_id, "error": str(e)})
+        return None
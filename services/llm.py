@@ -0,0 +1,138 @@
+# 📁 app/services/llm.py
+# Gemini calls run on a small dedicated thread pool so the synchronous SDK
+# never blocks the event loop. Identical queries share one upstream call.
+
+import asyncio, os, re, time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+
+import google.generativeai as genai
+
+from services.cache import TTLCache
+from services.metrics import ERRORS, LLM_REQUEST_SECONDS, LLM_TOKENS
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+CHAT_CACHE_TTL = float(os.getenv("CHAT_CACHE_TTL", "600"))
+CHAT_CACHE_SIZE = int(os.getenv("CHAT_CACHE_SIZE", "1024"))
+
+_executor = ThreadPoolExecutor(max_workers=LLM_CONCURRENCY, thread_name_prefix="llm")
+_model = None
+
+response_cache = TTLCache(maxsize=CHAT_CACHE_SIZE, ttl=CHAT_CACHE_TTL, name="chat")
+_inflight: Dict[str, asyncio.Future] = {}
+
+def get_model():
+    """Shared GenerativeModel, built on first use"""
+    global _model
+    if _model is None:
+        _model = genai.GenerativeModel(GEMINI_MODEL)
+    return _model
+
+def set_model(model):
+    """Swap in a different model object (e.g. a stub with generate_content)"""
+    global _model
+    _model = model
+
+def record_usage(response):
+    """Count the prompt / completion tokens Gemini reports for a response, if any"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    LLM_TOKENS.inc(getattr(usage, "prompt_token_count", 0) or 0, kind="prompt")
+    LLM_TOKENS.inc(getattr(usage, "candidates_token_count", 0) or 0, kind="completion")
+
+def _generate_content(prompt: str):
+    start = time.perf_counter()
+    try:
+        response = get_model().generate_content(prompt)
+    except Exception:
+        ERRORS.inc(component="llm")
+        raise
+    finally:
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, mode="generate")
+    record_usage(response)
+    return response
+
+def submit(prompt: str) -> "Future":
+    """Queue a generate_content call on the LLM pool from synchronous code (ingestion)"""
+    return _executor.submit(_generate_content, prompt)
+
+async def generate(prompt: str) -> str:
+    """Run generate_content on the LLM pool and return the response text"""
+    loop = asyncio.get_running_loop()
+    response = await loop.run_in_executor(_executor, _generate_content, prompt)
+    return response.text
+
+async def stream_generate(prompt: str) -> AsyncIterator[str]:
+    """Yield response text chunks as Gemini produces them.
+
+    The blocking SDK iterator runs on the LLM pool and hands chunks back to
+    the event loop through a queue.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    def produce():
+        start = time.perf_counter()
+        chunk = None
+        try:
+            for chunk in get_model().generate_content(prompt, stream=True):
+                text = getattr(chunk, "text", "")
+                if text:
+                    loop.call_soon_threadsafe(queue.put_nowait, text)
+            # The final chunk carries the usage totals for the whole response
+            record_usage(chunk)
+        except Exception as e:
+            ERRORS.inc(component="llm")
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, mode="stream")
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    producer = loop.run_in_executor(_executor, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        await asyncio.shield(producer)
+
+def normalize_query(query: str) -> str:
+    """Cache key for a chat query: case, spacing and trailing punctuation don't matter"""
+    return re.sub(r"\s+", " ", query).strip().lower().rstrip("?!. ")
+
+async def cached_call(key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached result for `key`, join an identical call in flight, or run `factory`.
+
+    Only successful results are cached; an exception is raised to every
+    caller that was waiting on that run.
+    """
+    cached = response_cache.get(key)
+    if cached is not None:
+        return cached
+
+    future = _inflight.get(key)
+    if future is not None:
+        return await asyncio.shield(future)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await factory()
+    except BaseException as e:
+        future.set_exception(e)
+        # Mark retrieved so an unobserved failure doesn't log a warning
+        future.exception()
+        raise
+    else:
+        response_cache.set(key, result)
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
@@ -0,0 +1,245 @@
+# 📁 app/services/mailer.py
+# Outbound mail queue. A few worker threads each hold one authenticated SMTP
+# connection and reuse it across messages; /send-email only enqueues.
+
+import logging, os, queue, random, smtplib, threading, time, uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.metrics import ERRORS, SMTP_SEND_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept for status polls; queued ones are always kept until they finish
+MAX_TRACKED_JOBS = 10000
+
+def smtp_settings_from_env() -> Dict[str, Any]:
+    return {
+        "server": os.getenv("SMTP_SERVER", "smtp.gmail.com"),
+        "port": int(os.getenv("SMTP_PORT", "587")),
+        "sender": os.getenv("SENDER_EMAIL"),
+        "password": os.getenv("SENDER_PASSWORD"),
+        "starttls": os.getenv("SMTP_STARTTLS", "true").lower() != "false",
+        "pool_size": int(os.getenv("SMTP_POOL_SIZE", "3")),
+        "max_retries": int(os.getenv("SMTP_MAX_RETRIES", "3")),
+        "retry_backoff": float(os.getenv("SMTP_RETRY_BACKOFF", "1.0")),
+        "idle_timeout": float(os.getenv("SMTP_IDLE_TIMEOUT", "60")),
+        "timeout": float(os.getenv("SMTP_TIMEOUT", "30")),
+    }
+
+def missing_config() -> Optional[str]:
+    """Error detail if the sender account isn't configured, else None"""
+    sender_email = os.getenv("SENDER_EMAIL")
+    sender_password = os.getenv("SENDER_PASSWORD")
+    # A local relay (SMTP_STARTTLS=false) may accept mail without a login
+    needs_login = os.getenv("SMTP_STARTTLS", "true").lower() != "false"
+    if not sender_email or (needs_login and not sender_password):
+        return f"Email configuration not found. SENDER_EMAIL: {bool(sender_email)}, SENDER_PASSWORD: {bool(sender_password)}"
+    return None
+
+def build_message(sender: str, to: str, subject: str, html: str) -> MIMEMultipart:
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = sender
+    msg['To'] = to
+    msg.attach(MIMEText(html, 'html'))
+    return msg
+
+class PooledSMTPConnection:
+    """One SMTP session that is opened lazily and reopened after errors or idling"""
+
+    def __init__(self, settings: Dict[str, Any]):
+        self.settings = settings
+        self.server: Optional[smtplib.SMTP] = None
+        self.last_used = 0.0
+
+    def _open(self):
+        s = self.settings
+        server = smtplib.SMTP(s["server"], s["port"], timeout=s["timeout"])
+        if s["starttls"]:
+            server.starttls()
+        if s["password"]:
+            server.login(s["sender"], s["password"])
+        self.server = server
+
+    def _healthy(self) -> bool:
+        if self.server is None:
+            return False
+        if time.monotonic() - self.last_used < self.settings["idle_timeout"]:
+            return True
+        # Idle long enough that the server may have dropped us; check before reuse
+        try:
+            return self.server.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+        except OSError:
+            return False
+
+    def send(self, msg: MIMEMultipart):
+        if not self._healthy():
+            self.close()
+            self._open()
+        self.server.send_message(msg)
+        self.last_used = time.monotonic()
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+        self.server = None
+
+class MailQueue:
+    """Background delivery queue backed by a small pool of reused SMTP connections"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        self.settings = settings
+        # The queue carries the job itself (and its callback), so delivery never depends on the status map
+        self._queue: "queue.Queue[Optional[Tuple[Dict[str, Any], Optional[Callable]]]]" = queue.Queue()
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Ids of sent / failed jobs, oldest first: the only ones ever evicted
+        self._finished: "deque[str]" = deque()
+        self._jobs_lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return any(worker.is_alive() for worker in self._workers)
+
+    def start(self):
+        with self._start_lock:
+            if self.running:
+                return
+            # Read settings at start so values loaded from .env apply
+            if self.settings is None:
+                self.settings = smtp_settings_from_env()
+            self._workers = [
+                threading.Thread(target=self._work, name=f"smtp-worker-{i}", daemon=True)
+                for i in range(max(1, self.settings["pool_size"]))
+            ]
+            for worker in self._workers:
+                worker.start()
+
+    def stop(self, timeout: float = 5.0):
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+
+    def enqueue(self, to: str, subject: str, html: str,
+                on_done: Optional[Callable[[Dict[str, Any]], None]] = None) -> str:
+        """Queue one message and return its job id.
+
+        `on_done` is called from the delivery thread with the job's final state
+        once it is sent or has failed, however long ago it left the job map.
+        """
+        self.start()
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "to": to,
+            "subject": subject,
+            "html": html,
+            "status": "queued",
+            "attempts": 0,
+            "error": None,
+            "created_at": datetime.utcnow().isoformat(),
+            "sent_at": None
+        }
+        with self._jobs_lock:
+            self._jobs[job_id] = job
+            self._trim()
+        self._queue.put((job, on_done))
+        return job_id
+
+    def _trim(self):
+        # Caller holds _jobs_lock
+        while len(self._jobs) > MAX_TRACKED_JOBS and self._finished:
+            self._jobs.pop(self._finished.popleft(), None)
+
+    def job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Public view of a job's state (without the message body)"""
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return self._view(job)
+
+    @staticmethod
+    def _view(job: Dict[str, Any]) -> Dict[str, Any]:
+        # Caller holds _jobs_lock
+        return {k: v for k, v in job.items() if k != "html"}
+
+    def join(self):
+        """Block until every queued message has been processed"""
+        self._queue.join()
+
+    def _work(self):
+        connection = PooledSMTPConnection(self.settings)
+        try:
+            while True:
+                item = self._queue.get()
+                try:
+                    if item is None:
+                        return
+                    job, on_done = item
+                    self._deliver(connection, job)
+                    if on_done is not None:
+                        with self._jobs_lock:
+                            view = self._view(job)
+                        try:
+                            on_done(view)
+                        except Exception:
+                            logger.exception("Mail job callback failed", extra={"job_id": job["id"]})
+                finally:
+                    self._queue.task_done()
+        finally:
+            connection.close()
+
+    def _update(self, job: Dict[str, Any], **changes):
+        # Under the lock job() copies with, so a status poll never sees a half-updated dict
+        with self._jobs_lock:
+            job.update(changes)
+            if changes.get("status") in ("sent", "failed"):
+                job.pop("html", None)
+                self._finished.append(job["id"])
+                self._trim()
+
+    def _deliver(self, connection: PooledSMTPConnection, job: Dict[str, Any]):
+        with self._jobs_lock:
+            job_id, to, subject, html = job["id"], job["to"], job["subject"], job["html"]
+        s = self.settings
+        msg = build_message(s["sender"], to, subject, html)
+
+        error = None
+        for attempt in range(1, s["max_retries"] + 1):
+            self._update(job, attempts=attempt, status="sending")
+            start = time.perf_counter()
+            try:
+                connection.send(msg)
+            except (smtplib.SMTPException, OSError) as e:
+                SMTP_SEND_SECONDS.observe(time.perf_counter() - start, outcome="error")
+                connection.close()
+                error = str(e)
+                self._update(job, error=error)
+                if isinstance(e, smtplib.SMTPRecipientsRefused) or attempt == s["max_retries"]:
+                    break
+                # Exponential backoff with jitter before reconnecting
+                time.sleep(s["retry_backoff"] * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+            else:
+                SMTP_SEND_SECONDS.observe(time.perf_counter() - start, outcome="sent")
+                self._update(job, status="sent", error=None, sent_at=datetime.utcnow().isoformat())
+                return
+
+        self._update(job, status="failed")
+        ERRORS.inc(component="smtp")
+        logger.warning("Email delivery failed", extra={"job_id": job_id, "attempts": attempt, "error": error})
+
+# Shared queue used by /send-email
+mail_queue = MailQueue()
@@ -0,0 +1,158 @@
+# 📁 app/services/metrics.py
+# Prometheus instrumentation without extra dependencies: thread-safe counters
+# and histograms rendered in the text exposition format for /metrics, and an
+# ASGI middleware that times every request by its route template.
+
+import bisect, threading, time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+COUNT_BUCKETS = (0, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_metrics: List["_Metric"] = []
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._samples(items))
+        return lines
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self, items):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in items]
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        # First bucket whose upper bound is >= value; the extra slot is +Inf
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self, items):
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                labels = _format_labels(self.labelnames, key, 'le="%s"' % le)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+def render() -> str:
+    """Every registered metric in the Prometheus text format"""
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Ingestion
+FEED_FETCH_SECONDS = Histogram("taaza_feed_fetch_seconds", "Feed download time per source", ["source"])
+FEED_PARSE_SECONDS = Histogram("taaza_feed_parse_seconds", "Feed XML parse time per source", ["source"])
+FEED_BYTES = Histogram("taaza_feed_bytes", "Bytes downloaded per feed fetch", ["source"], buckets=SIZE_BUCKETS)
+FEED_ENTRIES = Histogram("taaza_feed_entries", "Entries parsed per feed fetch", ["source"], buckets=COUNT_BUCKETS)
+DEDUP_HITS = Counter("taaza_dedup_hits_total", "Articles matched to an earlier one (kind=title: dropped, kind=story: joined a cluster)", ["kind"])
+
+# Storage and external services
+DB_OPERATION_SECONDS = Histogram("taaza_db_operation_seconds", "Article store operation time", ["backend", "operation"])
+LLM_REQUEST_SECONDS = Histogram("taaza_llm_request_seconds", "Gemini call latency", ["mode"])
+LLM_TOKENS = Counter("taaza_llm_tokens_total", "Gemini tokens used", ["kind"])
+SMTP_SEND_SECONDS = Histogram("taaza_smtp_send_seconds", "SMTP send attempt latency", ["outcome"])
+WHATSAPP_SEND_SECONDS = Histogram("taaza_whatsapp_send_seconds", "WhatsApp digest delivery latency (all chunks)", ["transport", "outcome"])
+
+# Caches and failures
+CACHE_HITS = Counter("taaza_cache_hits_total", "Cache hits", ["cache"])
+CACHE_MISSES = Counter("taaza_cache_misses_total", "Cache misses", ["cache"])
+ERRORS = Counter("taaza_errors_total", "Errors by component", ["component"])
+
+# HTTP
+HTTP_REQUEST_SECONDS = Histogram("taaza_http_request_seconds", "Request latency by route template", ["method", "route", "status"])
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no per-request task or body buffering) recording HTTP_REQUEST_SECONDS"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope; use its template, not the raw path
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status
+            )
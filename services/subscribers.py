@@ -0,0 +1,19 @@
+# 📁 app/services/subscribers.py
+# Stored subscriber segments for digest broadcasts, kept in a JSON file:
+# {"daily": {"emails": ["a@example.com"], "whatsapp": ["+91..."]}, ...}
+
+import json, os
+from typing import Dict, List
+
+def load_segments(path: str = None) -> Dict[str, Dict[str, List[str]]]:
+    path = path or os.getenv("SUBSCRIBERS_PATH", "subscribers.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def get_segment(name: str) -> Dict[str, List[str]]:
+    """Recipients of a named segment; raises KeyError if it doesn't exist"""
+    segment = load_segments()[name]
+    return {"emails": list(segment.get("emails", [])), "whatsapp": list(segment.get("whatsapp", []))}
@@ -0,0 +1,169 @@
+# 📁 app/services/summarizer.py
+# Optional ingestion stage that writes short summaries for articles whose
+# feed summary is empty or boilerplate. Many articles go to Gemini in one
+# structured request, and every result is cached under a hash of the
+# article's content so nothing is summarized twice.
+
+import hashlib, json, logging, os, re
+from typing import Any, Dict, List, Tuple
+
+from services import llm
+from services.cache import TTLCache
+from services.metrics import ERRORS
+
+logger = logging.getLogger(__name__)
+
+SUMMARIZE_AT_INGEST = os.getenv("SUMMARIZE_AT_INGEST", "false").lower() == "true"
+SUMMARY_BATCH_SIZE = int(os.getenv("SUMMARY_BATCH_SIZE", "20"))  # articles per Gemini request
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "2"))  # batch requests in flight at once
+SUMMARY_TOKEN_BUDGET = int(os.getenv("SUMMARY_TOKEN_BUDGET", "30000"))  # estimated tokens per ingestion run
+SUMMARY_TIMEOUT = float(os.getenv("SUMMARY_TIMEOUT", "60"))
+MIN_SUMMARY_CHARS = 40
+SUMMARY_WORDS = 40
+OUTPUT_TOKENS_PER_ITEM = 80
+INPUT_CHARS_PER_ITEM = 300
+
+_BOILERPLATE = re.compile(r"^(read (more|full story|full article)|click here|continue reading|\W*)$", re.IGNORECASE)
+_JSON_ARRAY = re.compile(r"\[.*\]", re.DOTALL)
+
+PROMPT_HEADER = f"""
+    Summarize each news article below in at most {SUMMARY_WORDS} words of plain text.
+    Use only the information given; do not add facts.
+    Respond with a JSON array only, one object per article, in the form
+    [{{"id": 1, "summary": "..."}}]
+
+    Articles (one JSON object per line):
+"""
+
+# Front of the article-store cache for the current process
+summary_cache = TTLCache(maxsize=10000, name="summary")
+
+def content_key(article: Dict[str, Any]) -> str:
+    """Stable key for an article's content: the same link, title and summary never get summarized twice"""
+    text = "\x1f".join((article.get("link") or "", article.get("title") or "", article.get("summary") or ""))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def needs_summary(article: Dict[str, Any]) -> bool:
+    summary = (article.get("summary") or "").strip()
+    if len(summary) < MIN_SUMMARY_CHARS or _BOILERPLATE.match(summary):
+        return True
+    # Some feeds repeat the headline as the summary
+    return summary.lower().rstrip(".") == (article.get("title") or "").strip().lower().rstrip(".")
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+def build_prompt(items: List[Tuple[int, Dict[str, Any]]]) -> str:
+    lines = [
+        json.dumps({"id": item_id, "source": a.get("source", ""), "title": a.get("title", ""),
+                    "summary": (a.get("summary") or "")[:INPUT_CHARS_PER_ITEM]}, ensure_ascii=False)
+        for item_id, a in items
+    ]
+    return PROMPT_HEADER + "\n".join(lines)
+
+def parse_summaries(text: str) -> Dict[int, str]:
+    """{id: summary} from the model's JSON array, tolerating code fences or chatter around it"""
+    match = _JSON_ARRAY.search(text or "")
+    if not match:
+        return {}
+    try:
+        items = json.loads(match.group(0))
+    except ValueError:
+        return {}
+    result = {}
+    for item in items if isinstance(items, list) else []:
+        if isinstance(item, dict) and isinstance(item.get("summary"), str) and item["summary"].strip():
+            try:
+                result[int(item["id"])] = item["summary"].strip()
+            except (KeyError, TypeError, ValueError):
+                continue
+    return result
+
+def _apply(article: Dict[str, Any], summary: str):
+    article["summary"] = summary
+    article["summary_generated"] = True
+
+def summarize_articles(articles: List[Dict[str, Any]], repository=None,
+                       token_budget: int = SUMMARY_TOKEN_BUDGET) -> Dict[str, int]:
+    """Fill in generated summaries in place; returns counts of what happened.
+
+    Cached summaries are applied first (process cache, then the article
+    store). The rest are sent in batches of SUMMARY_BATCH_SIZE, at most
+    SUMMARY_CONCURRENCY requests at a time, until the estimated token budget
+    for this run is spent; leftovers are picked up by a later run.
+    """
+    stats = {"candidates": 0, "cached": 0, "generated": 0, "skipped": 0, "failed": 0, "requests": 0}
+    pending: Dict[str, List[Dict[str, Any]]] = {}
+    for article in articles:
+        if article.get("summary_generated") or not needs_summary(article):
+            continue
+        stats["candidates"] += 1
+        key = content_key(article)
+        cached = summary_cache.get(key)
+        if cached is not None:
+            _apply(article, cached)
+            stats["cached"] += 1
+        else:
+            pending.setdefault(key, []).append(article)
+
+    if pending and repository is not None and repository.available:
+        try:
+            for key, summary in repository.get_summaries(list(pending)).items():
+                summary_cache.set(key, summary)
+                for article in pending.pop(key):
+                    _apply(article, summary)
+                    stats["cached"] += 1
+        except Exception as e:
+            logger.warning("Failed to read cached summaries", extra={"error": str(e)})
+
+    # Batches within the token budget
+    batches: List[List[Tuple[int, str, Dict[str, Any]]]] = []
+    batch: List[Tuple[int, str, Dict[str, Any]]] = []
+    spent = estimate_tokens(PROMPT_HEADER)
+    for item_id, (key, group) in enumerate(pending.items(), 1):
+        article = group[0]
+        cost = estimate_tokens(article.get("title", "") + (article.get("summary") or "")[:INPUT_CHARS_PER_ITEM]) + OUTPUT_TOKENS_PER_ITEM
+        if spent + cost > token_budget:
+            stats["skipped"] += len(group)
+            continue
+        spent += cost
+        batch.append((item_id, key, article))
+        if len(batch) >= SUMMARY_BATCH_SIZE:
+            batches.append(batch)
+            batch = []
+            spent += estimate_tokens(PROMPT_HEADER)
+    if batch:
+        batches.append(batch)
+
+    generated: Dict[str, str] = {}
+    for start in range(0, len(batches), SUMMARY_CONCURRENCY):
+        wave = batches[start:start + SUMMARY_CONCURRENCY]
+        futures = [(llm.submit(build_prompt([(item_id, a) for item_id, _, a in b])), b) for b in wave]
+        stats["requests"] += len(futures)
+        for future, b in futures:
+            try:
+                summaries = parse_summaries(future.result(timeout=SUMMARY_TIMEOUT).text)
+            except Exception as e:
+                ERRORS.inc(component="summarizer")
+                logger.warning("Summary batch failed", extra={"articles": len(b), "error": str(e)})
+                summaries = {}
+            for item_id, key, _ in b:
+                summary = summaries.get(item_id)
+                if summary is None:
+                    stats["failed"] += len(pending[key])
+                    continue
+                generated[key] = summary
+                summary_cache.set(key, summary)
+                for article in pending[key]:
+                    _apply(article, summary)
+                    stats["generated"] += 1
+
+    if generated and repository is not None and repository.available:
+        try:
+            repository.put_summaries(generated)
+        except Exception as e:
+            logger.warning("Failed to store generated summaries", extra={"error": str(e)})
+
+    if stats["candidates"]:
+        logger.info("Summarized articles", extra=stats)
+    return stats
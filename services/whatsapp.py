@@ -0,0 +1,200 @@
+# 📁 app/services/whatsapp.py
+# Async WhatsApp delivery: one pooled HTTP client to the Graph API, a token
+# bucket matching the per-number send limit, jittered retries, and a file
+# transport that stands in for the API when credentials aren't configured.
+
+import asyncio, logging, os, random, time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from services.metrics import ERRORS, WHATSAPP_SEND_SECONDS
+
+logger = logging.getLogger(__name__)
+
+GRAPH_API_URL = "https://graph.facebook.com/v17.0/{phone_id}/messages"
+WHATSAPP_TEXT_LIMIT = 4096  # Max characters in a text message body
+PLACEHOLDER_TOKEN = "your_whatsapp_business_api_token"
+
+class WhatsAppAPIError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"WhatsApp API error: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+def split_into_chunks(header: str, blocks: List[str], footer: str, limit: int = WHATSAPP_TEXT_LIMIT) -> List[str]:
+    """Pack header + article blocks + footer into ordered messages of at most `limit` chars.
+
+    Splits only on article boundaries; a single block longer than the limit
+    is cut into limit-sized pieces as a last resort.
+    """
+    chunks = []
+    current = header
+    for block in blocks + [footer]:
+        if len(current) + len(block) <= limit:
+            current += block
+            continue
+        if current.strip():
+            chunks.append(current)
+        current = ""
+        while len(block) > limit:
+            chunks.append(block[:limit])
+            block = block[limit:]
+        current = block
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+def normalize_phone(number: str) -> str:
+    # Clean phone number (remove non-digits except +)
+    phone_number = ''.join(c for c in number if c.isdigit() or c == '+')
+    if not phone_number.startswith('+'):
+        phone_number = '+' + phone_number
+    return phone_number
+
+class TokenBucket:
+    """Async token bucket: `rate` sends per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+class GraphTransport:
+    """Sends text messages through the WhatsApp Cloud API on one pooled connection"""
+
+    name = "graph"
+    simulation = False
+
+    def __init__(self, token: str, phone_id: str, rate: float = 80, max_retries: int = 3,
+                 retry_backoff: float = 0.5, timeout: float = 10.0):
+        self.url = GRAPH_API_URL.format(phone_id=phone_id)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.bucket = TokenBucket(rate)
+        self.client = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20)
+        )
+
+    async def _post(self, payload: Dict[str, Any]) -> httpx.Response:
+        for attempt in range(1, self.max_retries + 1):
+            await self.bucket.acquire()
+            try:
+                response = await self.client.post(self.url, json=payload)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise WhatsAppAPIError(503, str(e))
+            else:
+                # Retry throttling and server errors; anything else is final
+                if response.status_code != 429 and response.status_code < 500:
+                    return response
+                if attempt == self.max_retries:
+                    return response
+            await asyncio.sleep(self.retry_backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+
+    async def send(self, to: str, messages: List[str]) -> Dict[str, Any]:
+        phone_number = normalize_phone(to)
+        start = time.perf_counter()
+        try:
+            # Sequential so the recipient sees the chunks in order
+            for body in messages:
+                payload = {
+                    "messaging_product": "whatsapp",
+                    "to": phone_number,
+                    "type": "text",
+                    "text": {"body": body}
+                }
+                response = await self._post(payload)
+                if response.status_code != 200:
+                    raise WhatsAppAPIError(response.status_code, response.text)
+        except Exception:
+            ERRORS.inc(component="whatsapp")
+            WHATSAPP_SEND_SECONDS.observe(time.perf_counter() - start, transport=self.name, outcome="error")
+            raise
+        WHATSAPP_SEND_SECONDS.observe(time.perf_counter() - start, transport=self.name, outcome="sent")
+        return {"messages": len(messages)}
+
+    async def close(self):
+        await self.client.aclose()
+
+class FileTransport:
+    """Local stand-in for the API: writes each digest to a text file instead of sending it"""
+
+    name = "file"
+    simulation = True
+
+    def __init__(self, directory: str = "."):
+        self.directory = directory
+
+    def _write(self, to: str, messages: List[str]) -> str:
+        # Microseconds keep concurrent simulated sends from overwriting each other
+        timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S_%f')
+        filename = os.path.join(self.directory, f"whatsapp_message_{timestamp}.txt")
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(f"WhatsApp Message for: {to}\n")
+            f.write(f"Timestamp: {datetime.now()}\n")
+            f.write("="*50 + "\n\n")
+            f.write(("\n\n" + "="*50 + "\n\n").join(messages))
+        return filename
+
+    async def send(self, to: str, messages: List[str]) -> Dict[str, Any]:
+        """Save the digest; a failed write is logged, not raised, since nothing was meant to be delivered"""
+        start = time.perf_counter()
+        try:
+            filename = await asyncio.to_thread(self._write, to, messages)
+        except OSError as e:
+            ERRORS.inc(component="whatsapp")
+            WHATSAPP_SEND_SECONDS.observe(time.perf_counter() - start, transport=self.name, outcome="error")
+            logger.warning("Failed to save WhatsApp simulation", extra={"directory": self.directory, "error": str(e)})
+            return {"messages": len(messages), "filename": None}
+        WHATSAPP_SEND_SECONDS.observe(time.perf_counter() - start, transport=self.name, outcome="sent")
+        return {"messages": len(messages), "filename": filename}
+
+    async def close(self):
+        pass
+
+_transport = None
+
+def get_transport():
+    """Shared transport, chosen on first use: the Graph API when credentials are set, else the file stand-in"""
+    global _transport
+    if _transport is None:
+        token = os.getenv("WHATSAPP_TOKEN")
+        phone_id = os.getenv("WHATSAPP_PHONE_ID")
+        if os.getenv("WHATSAPP_TRANSPORT", "").lower() == "file" or not token or not phone_id or token == PLACEHOLDER_TOKEN:
+            _transport = FileTransport(os.getenv("WHATSAPP_OUTBOX", "."))
+        else:
+            _transport = GraphTransport(
+                token,
+                phone_id,
+                rate=float(os.getenv("WHATSAPP_RATE_PER_SECOND", "80")),
+                max_retries=int(os.getenv("WHATSAPP_MAX_RETRIES", "3"))
+            )
+    return _transport
+
+def set_transport(transport):
+    """Swap the active transport (load tests, local runs)"""
+    global _transport
+    _transport = transport
+
+async def close_transport():
+    global _transport
+    if _transport is not None:
+        await _transport.close()
+    _transport = None
@@ -0,0 +1,229 @@
+# 📁 app/storage/archive.py
+# Retention for the article store. The store keeps a hot window of recent
+# articles (ARTICLE_HOT_DAYS); older days are moved into gzip-compressed
+# JSONL segments on local disk, one per publish day, with a small index of
+# per-source counts so /archive only opens the segments a query can match.
+
+import gzip, json, logging, os, tempfile, threading
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from services.http_cache import dumps
+from services.metrics import ERRORS
+
+logger = logging.getLogger(__name__)
+
+HOT_DAYS = int(os.getenv("ARTICLE_HOT_DAYS", "14"))
+# The store's TTL index expires articles this many days after the hot window,
+# as a backstop in case archival stops running. It is only created once
+# archival has caught up, so history is never expired before it is archived.
+ARCHIVE_GRACE_DAYS = int(os.getenv("ARCHIVE_GRACE_DAYS", "2"))
+ARCHIVE_MAX_DAYS_PER_RUN = int(os.getenv("ARCHIVE_MAX_DAYS_PER_RUN", "30"))
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, dt_time.min, tzinfo=timezone.utc)
+
+def hot_window_start(now: Optional[datetime] = None) -> datetime:
+    """Midnight UTC of the oldest day still kept in the article store"""
+    now = now or datetime.now(timezone.utc)
+    return _day_start((now - timedelta(days=HOT_DAYS)).date())
+
+class ArticleArchive:
+    """Day-partitioned segments: <root>/YYYY/MM/YYYY-MM-DD.jsonl.gz plus <root>/index.json.
+
+    Each archival run appends one gzip member to the day's segment, which is
+    still a valid gzip file. Only the ingestion leader writes; any worker
+    may read.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self._root = root
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._index_identity: Optional[Tuple[str, int]] = None
+
+    @property
+    def root(self) -> str:
+        # Read on use so ARCHIVE_DIR from .env (or a benchmark's temp dir) applies
+        return self._root or os.getenv("ARCHIVE_DIR", "archive")
+
+    def segment_path(self, day: date) -> str:
+        return os.path.join(self.root, f"{day:%Y}", f"{day:%m}", f"{day.isoformat()}.jsonl.gz")
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, "index.json")
+
+    def index(self) -> Dict[str, Dict[str, Any]]:
+        """{"YYYY-MM-DD": {"count": n, "bytes": n, "sources": {source: n}}}, reloaded when the file changes"""
+        path = self.index_path
+        try:
+            identity = (path, os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            return {}
+        with self._lock:
+            if identity != self._index_identity:
+                with open(path, encoding="utf-8") as f:
+                    self._index = json.load(f)
+                self._index_identity = identity
+            return self._index
+
+    def _write_index(self, index: Dict[str, Dict[str, Any]]):
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".index-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index, f, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def append(self, day: date, articles: List[Dict[str, Any]]) -> int:
+        """Add one day's articles to its segment and the index; returns how many were new to it.
+
+        Articles whose content key the segment already holds are skipped, so a
+        feed that keeps listing an old story doesn't archive it on every run.
+        """
+        known = {article.get("content_key") for article in self.read_segment(day)}
+        articles = [article for article in articles if not article.get("content_key") or article["content_key"] not in known]
+        if not articles:
+            return 0
+        path = self.segment_path(day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        lines = b"".join(dumps({k: v for k, v in article.items() if k != "_id"}) + b"\n" for article in articles)
+        with open(path, "ab") as f:
+            f.write(gzip.compress(lines))
+        index = dict(self.index())
+        entry = dict(index.get(day.isoformat(), {"count": 0, "bytes": 0, "sources": {}}))
+        sources = dict(entry["sources"])
+        for article in articles:
+            source = article.get("source") or "Unknown"
+            sources[source] = sources.get(source, 0) + 1
+        entry.update(count=entry["count"] + len(articles), bytes=os.path.getsize(path), sources=sources)
+        index[day.isoformat()] = entry
+        self._write_index(index)
+        return len(articles)
+
+    def read_segment(self, day: date) -> List[Dict[str, Any]]:
+        articles = []
+        try:
+            with gzip.open(self.segment_path(day), "rb") as f:
+                for line in f:
+                    articles.append(json.loads(line))
+        except FileNotFoundError:
+            pass
+        except (EOFError, OSError, ValueError) as e:
+            # A member still being appended; keep what was complete
+            logger.debug("Partial archive segment", extra={"day": day.isoformat(), "error": str(e)})
+        return articles
+
+    def query(self, sources: Optional[Iterable[str]] = None, since: Optional[datetime] = None,
+              until: Optional[datetime] = None, limit: int = 50, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """Archived articles newest first, plus how many segments were read.
+
+        Matches since <= published_at < until, like /search: `until` is
+        exclusive. Days outside that range and days the index shows have
+        none of the requested sources are never opened.
+        """
+        wanted = set(sources) if sources else None
+        first = since.astimezone(timezone.utc).date().isoformat() if since else None
+        # The last day with anything before `until` (a midnight `until` ends the day before)
+        last = (until.astimezone(timezone.utc) - timedelta(microseconds=1)).date().isoformat() if until else None
+        since_iso = since.astimezone(timezone.utc).isoformat() if since else None
+        until_iso = until.astimezone(timezone.utc).isoformat() if until else None
+
+        results: List[Dict[str, Any]] = []
+        seen = set()
+        segments_read = 0
+        for day, entry in sorted(self.index().items(), reverse=True):
+            if (first and day < first) or (last and day > last):
+                continue
+            if wanted and not wanted.intersection(entry.get("sources", {})):
+                continue
+            segments_read += 1
+            articles = self.read_segment(date.fromisoformat(day))
+            articles.sort(key=lambda a: a.get("published_at") or "", reverse=True)
+            for article in articles:
+                # A run interrupted between archiving and deleting may archive an article twice
+                key = article.get("content_key") or article.get("link")
+                if key in seen:
+                    continue
+                seen.add(key)
+                published = article.get("published_at") or ""
+                if wanted and article.get("source") not in wanted:
+                    continue
+                if (since_iso and published < since_iso) or (until_iso and published >= until_iso):
+                    continue
+                results.append(article)
+            if len(results) >= offset + limit:
+                break
+        return results[offset:offset + limit], segments_read
+
+def archive_late_arrivals(articles: List[Dict[str, Any]], archive: Optional[ArticleArchive] = None,
+                          now: Optional[datetime] = None) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Write articles already older than the hot window straight to the archive.
+
+    Stored, they could be expired by the TTL index before the next archival
+    run. Returns the articles still inside the window, plus counts of late
+    articles archived and not written because of an error (failed).
+    """
+    archive = archive or article_archive
+    cutoff = hot_window_start(now)
+    fresh = []
+    late: Dict[date, List[Dict[str, Any]]] = {}
+    for article in articles:
+        published = article.get("published_at")
+        if isinstance(published, datetime):
+            if published.tzinfo is None:
+                published = published.replace(tzinfo=timezone.utc)
+            if published < cutoff:
+                late.setdefault(published.astimezone(timezone.utc).date(), []).append(article)
+                continue
+        fresh.append(article)
+    counts = {"archived": 0, "failed": 0}
+    for day in sorted(late):
+        try:
+            counts["archived"] += archive.append(day, late[day])
+        except OSError as e:
+            ERRORS.inc(component="archive")
+            logger.warning("Failed to archive articles", extra={"day": day.isoformat(), "error": str(e)})
+            counts["failed"] += len(late[day])
+    if late:
+        logger.info("Archived late arrivals", extra={"days": len(late), **counts})
+    return fresh, counts
+
+def archive_expired(repository, archive: Optional[ArticleArchive] = None, now: Optional[datetime] = None,
+                    max_days: Optional[int] = ARCHIVE_MAX_DAYS_PER_RUN) -> Dict[str, Any]:
+    """Move whole days older than the hot window from the store into the archive, oldest first.
+
+    At most `max_days` days per call (None for no limit). `caught_up` in the
+    result says whether nothing older than the hot window is left.
+    """
+    archive = archive or article_archive
+    cutoff = hot_window_start(now)
+    stats = {"days": 0, "articles": 0, "caught_up": False}
+    if not repository.available:
+        return stats
+    while max_days is None or stats["days"] < max_days:
+        oldest = repository.oldest_published()
+        if oldest is not None and oldest.tzinfo is None:
+            oldest = oldest.replace(tzinfo=timezone.utc)
+        if oldest is None or oldest >= cutoff:
+            stats["caught_up"] = True
+            break
+        day = oldest.astimezone(timezone.utc).date()
+        start, end = _day_start(day), _day_start(day + timedelta(days=1))
+        articles = repository.find_range(start, end, with_ids=True)
+        try:
+            # Written before deleting, so a failure leaves the articles in the store
+            archive.append(day, articles)
+        except OSError as e:
+            ERRORS.inc(component="archive")
+            logger.warning("Failed to archive articles", extra={"day": day.isoformat(), "error": str(e)})
+            break
+        # Only what was written: anything stored for that day since find_range stays for the next run
+        repository.delete_ids([article["_id"] for article in articles])
+        stats["days"] += 1
+        stats["articles"] += len(articles)
+    if stats["days"]:
+        logger.info("Archived articles", extra=stats)
+    return stats
+
+# Shared archive written by the ingestion leader and read by /archive
+article_archive = ArticleArchive()
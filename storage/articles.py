@@ -0,0 +1,555 @@
+# 📁 app/storage/articles.py
+# Single home for article persistence. Routes and the fetcher go through
+# get_repository() instead of opening their own database connections.
+
+import base64, bisect, hashlib, itertools, json, logging, os, threading, time
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from fastapi import HTTPException
+
+from services.metrics import DB_OPERATION_SECONDS, ERRORS
+from storage.archive import ARCHIVE_GRACE_DAYS, HOT_DAYS
+
+logger = logging.getLogger(__name__)
+
+# Storage settings. ARTICLE_STORE / MONGODB_URI / MONGODB_DB are read when the
+# repository is first created, so values loaded from .env by main.py apply.
+MONGODB_TIMEOUT_MS = int(os.getenv("MONGODB_TIMEOUT_MS", "5000"))
+MONGODB_POOL_SIZE = int(os.getenv("MONGODB_POOL_SIZE", "50"))
+RECONNECT_INTERVAL = 30  # seconds between reconnect attempts after a failed ping
+BACKFILL_BATCH_SIZE = 1000  # legacy documents keyed per round trip
+JOB_STATE_TTL = int(os.getenv("JOB_STATE_TTL_SECONDS", "86400"))  # how long shared job state is kept
+
+def encode_cursor(published_at, doc_id) -> str:
+    """Opaque `after` token pointing just past the given article"""
+    payload = {"p": published_at.isoformat() if published_at else None, "id": str(doc_id)}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+def decode_cursor(token: str) -> Tuple[Optional[datetime], str]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        published_at = datetime.fromisoformat(payload["p"]) if payload.get("p") else None
+        return published_at, str(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+# Query parameters that only track the click, not which article it is
+_TRACKING_PARAMS = {"fbclid", "gclid", "ocid", "cmpid", "ito", "at_medium", "at_campaign"}
+
+def canonical_link(link: str) -> str:
+    """Link normalized so trivially different URLs for the same article compare equal"""
+    try:
+        parts = urlsplit((link or "").strip())
+    except ValueError:
+        return (link or "").strip()
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ))
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme,
+                       parts.netloc.lower(), parts.path.rstrip("/") or "/", query, ""))
+
+def content_key(link: str, source: str = "", title: str = "") -> str:
+    """Identity of a stored article: a hash of its canonical link, or of source + title without one"""
+    text = canonical_link(link) if link else "\x1f".join((source or "", (title or "").strip().lower()))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def _timestamp(value) -> float:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return 0.0
+    if not isinstance(value, datetime):
+        return 0.0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+class ArticleRepository:
+    """Interface shared by the storage backends"""
+
+    name = "base"
+
+    @property
+    def available(self) -> bool:
+        raise NotImplementedError
+
+    def connect(self) -> bool:
+        return self.available
+
+    def close(self):
+        pass
+
+    def ensure_indexes(self):
+        pass
+
+    def ensure_ttl_index(self):
+        """Expire articles a little after they leave the hot window; only once archival has caught up"""
+        pass
+
+    def insert_new(self, articles: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Insert the articles whose `content_key` isn't stored yet.
+
+        Returns counts of articles that were new, already stored (duplicate)
+        and not written because of an error (failed).
+        """
+        raise NotImplementedError
+
+    def page(self, after: Optional[str] = None, limit: int = 50) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page newest first, plus the `after` token for the next page (None on the last page)"""
+        raise NotImplementedError
+
+    def stream(self, after: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def find_range(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                   limit: Optional[int] = None, with_ids: bool = False) -> List[Dict[str, Any]]:
+        """Articles with start <= published_at < end, newest first; with_ids keeps each one's `_id` for delete_ids"""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def oldest_published(self) -> Optional[datetime]:
+        """published_at of the oldest stored article, or None if the store is empty"""
+        raise NotImplementedError
+
+    def delete_ids(self, ids: List[Any]) -> int:
+        """Remove the articles with these `_id`s (exactly the ones just archived); returns how many"""
+        raise NotImplementedError
+
+    def get_summaries(self, keys: List[str]) -> Dict[str, str]:
+        """Generated summaries stored under the given content keys (missing keys are left out)"""
+        raise NotImplementedError
+
+    def put_summaries(self, summaries: Dict[str, str]):
+        raise NotImplementedError
+
+    def get_job(self, kind: str, job_id: str) -> Optional[Dict[str, Any]]:
+        """Last saved state of a background job ("mail" / "broadcast"), shared between workers"""
+        raise NotImplementedError
+
+    def put_job(self, kind: str, job: Dict[str, Any], overwrite: bool = True):
+        """Save a job's state; with overwrite=False only if nothing is saved for it yet"""
+        raise NotImplementedError
+
+class MongoArticleRepository(ArticleRepository):
+    """MongoDB backend with one pooled client, created on first use"""
+
+    name = "mongo"
+
+    def __init__(self, uri: Optional[str] = None, db_name: Optional[str] = None):
+        self.uri = uri or os.getenv("MONGODB_URI", "")
+        self.db_name = db_name or os.getenv("MONGODB_DB", "news")
+        self.client = None
+        self.collection = None
+        self._available = False
+        self._last_attempt = 0.0
+        self._lock = threading.Lock()
+
+    def connect(self) -> bool:
+        from pymongo import MongoClient
+        from pymongo.errors import PyMongoError
+
+        with self._lock:
+            if self._available:
+                return True
+            self._last_attempt = time.monotonic()
+            try:
+                if self.client is None:
+                    self.client = MongoClient(
+                        self.uri,
+                        serverSelectionTimeoutMS=MONGODB_TIMEOUT_MS,
+                        maxPoolSize=MONGODB_POOL_SIZE,
+                        tz_aware=True
+                    )
+                self.client.admin.command("ping")
+                self.collection = self.client[self.db_name]["articles"]
+                self._available = True
+                logger.info("MongoDB connected", extra={"db": self.db_name})
+            except PyMongoError as e:
+                ERRORS.inc(component="mongo")
+                logger.warning("MongoDB not available, running without database storage", extra={"error": str(e)})
+                self._available = False
+            return self._available
+
+    @property
+    def available(self) -> bool:
+        if not self._available and time.monotonic() - self._last_attempt >= RECONNECT_INTERVAL:
+            self.connect()
+        return self._available
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+        self.client = None
+        self.collection = None
+        self._available = False
+
+    def ensure_indexes(self):
+        if not self.available:
+            return
+        try:
+            # Matches the (published_at, _id) keyset sort used for pagination
+            self.collection.create_index([("published_at", -1), ("_id", -1)])
+            self._backfill_content_keys()
+            # One document per article; older documents without a key are left out of the index
+            self.collection.create_index(
+                "content_key", unique=True,
+                partialFilterExpression={"content_key": {"$type": "string"}}
+            )
+            # Job state only matters while someone may still poll for it
+            self.jobs.create_index("updated_at", expireAfterSeconds=JOB_STATE_TTL)
+        except Exception as e:
+            ERRORS.inc(component="mongo")
+            logger.warning("Failed to create indexes", extra={"error": str(e)})
+
+    def ensure_ttl_index(self):
+        from pymongo.errors import OperationFailure
+
+        if not self.available:
+            return
+        expire_after = (HOT_DAYS + ARCHIVE_GRACE_DAYS) * 86400
+        try:
+            self.collection.create_index("published_at", expireAfterSeconds=expire_after)
+        except OperationFailure:
+            # Already there with another window; change it in place
+            self.client[self.db_name].command(
+                "collMod", "articles",
+                index={"keyPattern": {"published_at": 1}, "expireAfterSeconds": expire_after}
+            )
+
+    def _backfill_content_keys(self, batch_size: int = BACKFILL_BATCH_SIZE):
+        """Key documents stored before content keys existed, skipping any that would collide.
+
+        Walks the legacy documents in batches so a large collection is never
+        held in memory at once.
+        """
+        from pymongo import UpdateOne
+
+        cursor = self.collection.find(
+            {"content_key": {"$exists": False}}, {"link": 1, "source": 1, "title": 1}
+        ).batch_size(batch_size)
+        scanned = keyed = 0
+        for batch in iter(lambda: list(itertools.islice(cursor, batch_size)), []):
+            keys = {doc["_id"]: content_key(doc.get("link"), doc.get("source"), doc.get("title")) for doc in batch}
+            # Earlier batches are already written, so this also sees the keys they assigned
+            taken = {doc["content_key"] for doc in self.collection.find(
+                {"content_key": {"$in": list(set(keys.values()))}}, {"content_key": 1, "_id": 0}
+            )}
+            operations = []
+            for doc_id, key in keys.items():
+                if key not in taken:
+                    taken.add(key)
+                    operations.append(UpdateOne({"_id": doc_id}, {"$set": {"content_key": key}}))
+            if operations:
+                self.collection.bulk_write(operations, ordered=False)
+            scanned += len(batch)
+            keyed += len(operations)
+        if scanned:
+            logger.info("Backfilled content keys", extra={"documents": scanned, "keyed": keyed})
+
+    def insert_new(self, articles: List[Dict[str, Any]]) -> Dict[str, int]:
+        from pymongo.errors import BulkWriteError
+
+        counts = {"new": 0, "duplicate": 0, "failed": 0}
+        if not articles:
+            return counts
+        if not self.available:
+            counts["failed"] = len(articles)
+            return counts
+        keys = [article["content_key"] for article in articles]
+        with DB_OPERATION_SECONDS.time(backend=self.name, operation="find_keys"):
+            stored = {doc["content_key"] for doc in self.collection.find(
+                {"content_key": {"$in": keys}}, {"content_key": 1, "_id": 0}
+            )}
+        # Copies, since insert_many adds an _id to each document it is given
+        fresh = [dict(article) for article in articles if article["content_key"] not in stored]
+        counts["duplicate"] = len(articles) - len(fresh)
+        if not fresh:
+            return counts
+        try:
+            with DB_OPERATION_SECONDS.time(backend=self.name, operation="insert_many"):
+                result = self.collection.insert_many(fresh, ordered=False)
+            counts["new"] = len(result.inserted_ids)
+        except BulkWriteError as e:
+            # Unordered: everything else was still attempted. Key collisions mean
+            # another writer stored the article first.
+            errors = e.details.get("writeErrors", [])
+            collisions = sum(1 for error in errors if error.get("code") == 11000)
+            counts["new"] = e.details.get("nInserted", 0)
+            counts["duplicate"] += collisions
+            counts["failed"] = len(errors) - collisions
+        return counts
+
+    def _keyset_query(self, after: Optional[str]) -> dict:
+        from bson import ObjectId
+        from bson.errors import InvalidId
+
+        if not after:
+            return {}
+        published_at, doc_id = decode_cursor(after)
+        try:
+            object_id = ObjectId(doc_id)
+        except InvalidId:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+        return {"$or": [
+            {"published_at": {"$lt": published_at}},
+            {"published_at": published_at, "_id": {"$lt": object_id}}
+        ]}
+
+    def page(self, after: Optional[str] = None, limit: int = 50):
+        query = self._keyset_query(after)
+        # Index-backed walk; fetch one extra to know whether there's another page
+        with DB_OPERATION_SECONDS.time(backend=self.name, operation="page"):
+            docs = list(
+                self.collection.find(query)
+                .sort([("published_at", -1), ("_id", -1)])
+                .limit(limit + 1)
+            )
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor(docs[-1].get("published_at"), docs[-1]["_id"])
+        for doc in docs:
+            doc.pop("_id", None)
+        return docs, next_cursor
+
+    def stream(self, after: Optional[str] = None, limit: Optional[int] = None):
+        query = self._keyset_query(after)
+        cursor = self.collection.find(query, {"_id": 0}).sort([("published_at", -1), ("_id", -1)]).batch_size(500)
+        if limit:
+            cursor = cursor.limit(limit)
+        # Query is built eagerly so a bad cursor fails before the response starts
+        return self._iterate(cursor)
+
+    @staticmethod
+    def _iterate(cursor):
+        try:
+            for doc in cursor:
+                yield doc
+        finally:
+            cursor.close()
+
+    def find_range(self, start=None, end=None, limit=None, with_ids=False):
+        query = {}
+        if start is not None or end is not None:
+            query["published_at"] = {}
+            if start is not None:
+                query["published_at"]["$gte"] = start
+            if end is not None:
+                query["published_at"]["$lt"] = end
+        cursor = self.collection.find(query, None if with_ids else {"_id": 0}).sort([("published_at", -1), ("_id", -1)])
+        if limit:
+            cursor = cursor.limit(limit)
+        with DB_OPERATION_SECONDS.time(backend=self.name, operation="find_range"):
+            return list(cursor)
+
+    def count(self) -> int:
+        with DB_OPERATION_SECONDS.time(backend=self.name, operation="count"):
+            return self.collection.estimated_document_count()
+
+    def oldest_published(self) -> Optional[datetime]:
+        doc = self.collection.find_one(
+            {"published_at": {"$type": "date"}}, {"published_at": 1, "_id": 0}, sort=[("published_at", 1)]
+        )
+        return doc["published_at"] if doc else None
+
+    def delete_ids(self, ids: List[Any]) -> int:
+        if not ids:
+            return 0
+        with DB_OPERATION_SECONDS.time(backend=self.name, operation="delete_ids"):
+            return self.collection.delete_many({"_id": {"$in": list(ids)}}).deleted_count
+
+    @property
+    def summaries(self):
+        return self.client[self.db_name]["summaries"]
+
+    def get_summaries(self, keys: List[str]) -> Dict[str, str]:
+        if not keys or not self.available:
+            return {}
+        with DB_OPERATION_SECONDS.time(backend=self.name, operation="get_summaries"):
+            return {doc["_id"]: doc["summary"] for doc in self.summaries.find({"_id": {"$in": list(keys)}})}
+
+    def put_summaries(self, summaries: Dict[str, str]):
+        from pymongo import UpdateOne
+
+        if not summaries or not self.available:
+            return
+        now = datetime.now(timezone.utc)
+        operations = [
+            UpdateOne({"_id": key}, {"$set": {"summary": summary, "created_at": now}}, upsert=True)
+            for key, summary in summaries.items()
+        ]
+        with DB_OPERATION_SECONDS.time(backend=self.name, operation="put_summaries"):
+            self.summaries.bulk_write(operations, ordered=False)
+
+    @property
+    def jobs(self):
+        return self.client[self.db_name]["jobs"]
+
+    def get_job(self, kind: str, job_id: str) -> Optional[Dict[str, Any]]:
+        if not self.available:
+            return None
+        with DB_OPERATION_SECONDS.time(backend=self.name, operation="get_job"):
+            doc = self.jobs.find_one({"_id": f"{kind}:{job_id}"})
+        return doc["state"] if doc else None
+
+    def put_job(self, kind: str, job: Dict[str, Any], overwrite: bool = True):
+        if not self.available:
+            return
+        doc = {"state": job, "updated_at": datetime.now(timezone.utc)}
+        with DB_OPERATION_SECONDS.time(backend=self.name, operation="put_job"):
+            self.jobs.update_one(
+                {"_id": f"{kind}:{job['id']}"},
+                {"$set" if overwrite else "$setOnInsert": doc},
+                upsert=True
+            )
+
+class MemoryArticleRepository(ArticleRepository):
+    """In-process backend with the same interface, for local runs and benchmarks.
+
+    Articles are kept in a list sorted by (published_at, insertion order), so
+    pages and range queries are a bisect plus a slice.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._keys: List[Tuple[float, int]] = []
+        self._docs: Dict[int, Dict[str, Any]] = {}
+        self._seen: Dict[str, int] = {}
+        self._summaries: Dict[str, str] = {}
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._seq = itertools.count(1)
+        self._lock = threading.RLock()
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    def insert_new(self, articles: List[Dict[str, Any]]) -> Dict[str, int]:
+        counts = {"new": 0, "duplicate": 0, "failed": 0}
+        with self._lock:
+            for article in articles:
+                key = article["content_key"]
+                if key in self._seen:
+                    counts["duplicate"] += 1
+                    continue
+                seq = next(self._seq)
+                self._seen[key] = seq
+                self._docs[seq] = dict(article)
+                bisect.insort(self._keys, (_timestamp(article.get("published_at")), seq))
+                counts["new"] += 1
+        return counts
+
+    def _start_index(self, after: Optional[str]) -> int:
+        """Index one past the newest key to return (we walk the sorted list backwards)"""
+        if not after:
+            return len(self._keys)
+        published_at, doc_id = decode_cursor(after)
+        try:
+            seq = int(doc_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+        return bisect.bisect_left(self._keys, (_timestamp(published_at), seq))
+
+    def page(self, after: Optional[str] = None, limit: int = 50):
+        with self._lock:
+            end = self._start_index(after)
+            start = max(0, end - limit)
+            keys = self._keys[start:end][::-1]
+            docs = [dict(self._docs[seq]) for _, seq in keys]
+            next_cursor = None
+            if start > 0 and keys:
+                last_seq = keys[-1][1]
+                next_cursor = encode_cursor(self._docs[last_seq].get("published_at"), last_seq)
+        return docs, next_cursor
+
+    def stream(self, after: Optional[str] = None, limit: Optional[int] = None):
+        with self._lock:
+            end = self._start_index(after)
+            start = max(0, end - limit) if limit else 0
+            keys = self._keys[start:end][::-1]
+            return iter([dict(self._docs[seq]) for _, seq in keys])
+
+    def find_range(self, start=None, end=None, limit=None, with_ids=False):
+        with self._lock:
+            lo = bisect.bisect_left(self._keys, (_timestamp(start), 0)) if start is not None else 0
+            hi = bisect.bisect_left(self._keys, (_timestamp(end), 0)) if end is not None else len(self._keys)
+            keys = self._keys[lo:hi][::-1]
+            if limit:
+                keys = keys[:limit]
+            if with_ids:
+                return [dict(self._docs[seq], _id=seq) for _, seq in keys]
+            return [dict(self._docs[seq]) for _, seq in keys]
+
+    def count(self) -> int:
+        return len(self._keys)
+
+    def oldest_published(self) -> Optional[datetime]:
+        with self._lock:
+            if not self._keys:
+                return None
+            return datetime.fromtimestamp(self._keys[0][0], timezone.utc)
+
+    def delete_ids(self, ids: List[Any]) -> int:
+        ids = set(ids)
+        with self._lock:
+            removed = 0
+            for seq in ids:
+                doc = self._docs.pop(seq, None)
+                if doc is not None:
+                    self._seen.pop(doc.get("content_key"), None)
+                    removed += 1
+            if removed:
+                self._keys = [key for key in self._keys if key[1] not in ids]
+            return removed
+
+    def get_summaries(self, keys: List[str]) -> Dict[str, str]:
+        with self._lock:
+            return {key: self._summaries[key] for key in keys if key in self._summaries}
+
+    def put_summaries(self, summaries: Dict[str, str]):
+        with self._lock:
+            self._summaries.update(summaries)
+
+    def get_job(self, kind: str, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._jobs.get(f"{kind}:{job_id}")
+
+    def put_job(self, kind: str, job: Dict[str, Any], overwrite: bool = True):
+        with self._lock:
+            if overwrite:
+                self._jobs[f"{kind}:{job['id']}"] = job
+            else:
+                self._jobs.setdefault(f"{kind}:{job['id']}", job)
+
+_repository: Optional[ArticleRepository] = None
+_repository_lock = threading.Lock()
+
+def get_repository() -> ArticleRepository:
+    """Process-wide repository, created on first use.
+
+    ARTICLE_STORE picks the backend ("mongo" or "memory"); it defaults to
+    mongo when MONGODB_URI is set.
+    """
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                store = os.getenv("ARTICLE_STORE") or ("mongo" if os.getenv("MONGODB_URI") else "memory")
+                if store == "mongo":
+                    _repository = MongoArticleRepository()
+                else:
+                    _repository = MemoryArticleRepository()
+    return _repository
+
+def set_repository(repository: ArticleRepository):
+    """Swap the active backend (benchmarks and local runs)"""
+    global _repository
+    _repository = repository
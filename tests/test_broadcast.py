@@ -0,0 +1,47 @@
+# 📁 app/tests/test_broadcast.py
+# Broadcasts larger than the mail queue's job map must still deliver every
+# message and report completion. Runs against the local SMTP stub.
+
+import asyncio
+
+import pytest
+
+from benchmarks.smtp_stub import SMTPStub
+from services import broadcast, mailer
+
+ARTICLES = [{"title": "Headline", "source": "Test", "summary": "Summary", "link": "https://example.com/a"}]
+
+@pytest.fixture
+def smtp_stub():
+    stub = SMTPStub().start()
+    yield stub
+    stub.stop()
+
+@pytest.fixture
+def mail_queue(monkeypatch, smtp_stub):
+    settings = mailer.smtp_settings_from_env()
+    settings.update(server="127.0.0.1", port=smtp_stub.port, starttls=False,
+                    sender="digest@localhost", password="", pool_size=2, max_retries=1)
+    queue = mailer.MailQueue(settings)
+    monkeypatch.setattr(mailer, "mail_queue", queue)
+    monkeypatch.setattr(mailer, "missing_config", lambda: None)
+    monkeypatch.setattr(mailer, "MAX_TRACKED_JOBS", 20)
+    yield queue
+    queue.stop()
+
+def test_broadcast_larger_than_job_map_completes(mail_queue, smtp_stub):
+    emails = [f"reader{i}@example.com" for i in range(3 * mailer.MAX_TRACKED_JOBS)]
+
+    async def run():
+        started = broadcast.start_broadcast(ARTICLES, emails, [])
+        await asyncio.gather(*broadcast._tasks)
+        await asyncio.to_thread(mail_queue.join)
+        return started["id"]
+
+    broadcast_id = asyncio.run(run())
+    result = broadcast.progress(broadcast_id)
+
+    assert smtp_stub.messages == len(emails)
+    assert result["status"] == "completed"
+    assert result["counts"] == {"sent": len(emails)}
+    assert len(mail_queue._jobs) <= mailer.MAX_TRACKED_JOBS